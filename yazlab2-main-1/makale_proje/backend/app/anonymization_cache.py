@@ -0,0 +1,119 @@
+import os
+from database import get_connection, timestamp
+from migrations import ensure_schema
+from storage import ContentStore
+
+class AnonymizationCache:
+    """Aynı PDF'in tekrar anonimleştirilmesini önleyen içerik-özeti önbelleği.
+
+    Kayıtlar (SHA-256, anonimleştirici sürümü) anahtarıyla makale.db içindeki
+    `anonymization_cache` tablosunda tutulur ve depodaki (ContentStore) anonim
+    PDF'in anahtarını gösterir. Toplam boyut max_bytes'ı aşarsa en uzun
+    süredir kullanılmayan kayıtlar silinir.
+    """
+
+    def __init__(self, db_path=None, max_bytes=1024 * 1024 * 1024, content_store=None):
+        self.db_path = db_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'makale.db')
+        self.max_bytes = max_bytes
+        self.content_store = content_store or ContentStore()
+        self.init_db()
+
+    def init_db(self):
+        ensure_schema(self.db_path)
+
+    def _now(self):
+        return timestamp()
+
+    def _count(self, cursor, name):
+        cursor.execute('''
+            INSERT INTO cache_stats (name, value) VALUES (?, 1)
+            ON CONFLICT(name) DO UPDATE SET value = value + 1
+        ''', (name,))
+
+    def lookup(self, content_hash, config_version):
+        """Önbellekte anonim PDF varsa depo anahtarını, yoksa None döndürür"""
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT file_path FROM anonymization_cache
+                WHERE content_hash = ? AND config_version = ?
+            ''', (content_hash, config_version))
+            row = cursor.fetchone()
+
+            # Dosya elle silinmişse kayıt geçersizdir
+            if row and not self.content_store.exists(row[0]):
+                cursor.execute('''
+                    DELETE FROM anonymization_cache
+                    WHERE content_hash = ? AND config_version = ?
+                ''', (content_hash, config_version))
+                row = None
+
+            if row:
+                cursor.execute('''
+                    UPDATE anonymization_cache SET last_used_at = ?
+                    WHERE content_hash = ? AND config_version = ?
+                ''', (self._now(), content_hash, config_version))
+                self._count(cursor, 'hits')
+            else:
+                self._count(cursor, 'misses')
+            conn.commit()
+            return row[0] if row else None
+
+    def store(self, content_hash, config_version, file_path):
+        """Anonimleştirme sonucunu (depo anahtarı) önbelleğe ekler ve boyut sınırını uygular"""
+        size_bytes = self.content_store.size(file_path)
+        now = self._now()
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO anonymization_cache
+                (content_hash, config_version, file_path, size_bytes, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (content_hash, config_version, file_path, size_bytes, now, now))
+            conn.commit()
+        self.evict()
+
+    def evict(self):
+        """Toplam boyut max_bytes altına inene kadar en eski kayıtları siler"""
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COALESCE(SUM(size_bytes), 0) FROM anonymization_cache')
+            total = cursor.fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+
+            cursor.execute('''
+                SELECT content_hash, config_version, file_path, size_bytes
+                FROM anonymization_cache
+                ORDER BY last_used_at
+            ''')
+            evicted = 0
+            for content_hash, config_version, file_path, size_bytes in cursor.fetchall():
+                if total <= self.max_bytes:
+                    break
+                cursor.execute('''
+                    DELETE FROM anonymization_cache
+                    WHERE content_hash = ? AND config_version = ?
+                ''', (content_hash, config_version))
+                # Dosya bir makaleye aitse silinmez, sadece önbellekten çıkar
+                cursor.execute('SELECT 1 FROM articles WHERE file_path = ? LIMIT 1', (file_path,))
+                if not cursor.fetchone():
+                    self.content_store.delete(file_path)
+                total -= size_bytes
+                evicted += 1
+                self._count(cursor, 'evictions')
+            conn.commit()
+            print(f"[INFO] Anonimleştirme önbelleğinden {evicted} kayıt çıkarıldı")
+            return evicted
+
+    def get_stats(self):
+        """İsabet/ıska sayaçlarını ve önbellek boyutunu döndürür"""
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT name, value FROM cache_stats')
+            stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+            stats.update(dict(cursor.fetchall()))
+            cursor.execute('SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM anonymization_cache')
+            stats['entries'], stats['size_bytes'] = cursor.fetchone()
+            stats['max_bytes'] = self.max_bytes
+            return stats
@@ -1,70 +1,204 @@
 import re
-import spacy
+import threading
+import time
+
+NER_MODEL = "xx_ent_wiki_sm"
+
+# Anonimleştirme sadece varlık tanımaya (NER) ihtiyaç duyar; modelde varsa
+# diğer bileşenler yüklenmez.
+UNUSED_COMPONENTS = ["senter", "sentencizer", "parser", "tagger", "morphologizer",
+                     "lemmatizer", "attribute_ruler", "textcat", "textcat_multilabel"]
+
+# Desen kuralları: (ad, düzenli ifade, yerine gelecek metin). Sıra önceliği belirler.
+DEFAULT_RULES = [
+    ("email", r'\b[\w\.-]+@[\w\.-]+\.\w+\b', '[EMAIL]'),
+    ("orcid", r'\b\d{4}-\d{4}-\d{4}-\d{3}[\dX]\b', '[ORCID]'),
+    ("telefon_gsm", r'\b\+?90?\s*\(?5\d{2}\)?\s*\d{3}\s*\d{2}\s*\d{2}\b', '[TELEFON]'),
+    ("telefon", r'\b\+?90?\s*\(?[1-9]\d{2}\)?\s*\d{3}\s*\d{2}\s*\d{2}\b', '[TELEFON]'),
+    ("tckn", r'\b\d{11}\b', '[TCKN]'),
+]
 
 class Anonymizer:
     def __init__(self):
         """
         Anonymizer sınıfı, metinlerdeki kişisel ve kurumsal bilgileri anonimleştirmek için kullanılır.
+        NER modeli ilk kullanımda (veya warm_up çağrıldığında) yüklenir.
         """
         print("[INFO][anonymizer.py]: Initializing Anonymizer.")
+        self._nlp = None
+        self._lock = threading.Lock()
+        # Modelin yüklenme süresi (sn); yüklenmediyse None
+        self.load_seconds = None
+        self.rules = list(DEFAULT_RULES)
+        self._compile_rules()
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            with self._lock:
+                if self._nlp is None:
+                    self._nlp = self._load_model()
+        return self._nlp
 
+    def _load_model(self):
+        # spacy'nin kendisini içe aktarmak da pahalı olduğu için burada yapılır
+        import spacy
+
+        print(f"[INFO][anonymizer.py]: Loading NER model {NER_MODEL}.")
+        start = time.perf_counter()
         try:
-            self.nlp = spacy.load("xx_ent_wiki_sm")
+            nlp = spacy.load(NER_MODEL, exclude=UNUSED_COMPONENTS)
         except OSError:
             print("[INFO][anonymizer.py]: Model not found. Downloading...")
-            spacy.cli.download("xx_ent_wiki_sm")
-            self.nlp = spacy.load("xx_ent_wiki_sm")
+            spacy.cli.download(NER_MODEL)
+            nlp = spacy.load(NER_MODEL, exclude=UNUSED_COMPONENTS)
+        self.load_seconds = time.perf_counter() - start
+        print(f"[INFO][anonymizer.py]: NER model loaded in {self.load_seconds:.2f}s (pipeline: {nlp.pipe_names}).")
+        return nlp
+
+    def is_ready(self):
+        """NER modeli yüklendiyse True döndürür"""
+        return self._nlp is not None
+
+    def warm_up(self):
+        """Modeli hemen yükler; worker süreçleri ilk işten önce çağırmalıdır."""
+        self.nlp
+        return self.load_seconds
+
+    def _compile_rules(self):
+        # Tüm kurallar tek bir alternasyonda birleşir; metin tek geçişte taranır.
+        # Grup adları kural sırasını (r0, r1, ...) gösterir: aynı konumda önce
+        # tanımlanan kural kazanır.
+        self._rule_patterns = {name: (re.compile(pattern), replacement) for name, pattern, replacement in self.rules}
+        self._replacements = {f"r{i}": replacement for i, (_, _, replacement) in enumerate(self.rules)}
+        self._scanner = re.compile("|".join(
+            f"(?P<r{i}>{pattern})" for i, (_, pattern, _) in enumerate(self.rules)
+        ))
+
+    def add_rule(self, name, pattern, replacement):
+        """
+        Yeni bir desen kuralı ekler (ör. öğrenci numarası). Kural birleşik
+        tarayıcıya eklenir; ek bir tarama geçişi oluşturmaz.
+
+        Örnek: anonymizer.add_rule("ogrenci_no", r'\b\d{9}\b', '[OGRENCI_NO]')
+        """
+        self.rules.append((name, pattern, replacement))
+        self._compile_rules()
+
+    def _replace_rule(self, name, text):
+        pattern, replacement = self._rule_patterns[name]
+        return pattern.sub(replacement, text)
 
     def anonymize_email(self, text):
         """
         Metindeki e-posta adreslerini anonimleştirir.
         """
-        return re.sub(r'\b[\w\.-]+@[\w\.-]+\.\w+\b', '[EMAIL]', text)
+        return self._replace_rule("email", text)
 
     def anonymize_phone(self, text):
         """
         Metindeki telefon numaralarını anonimleştirir.
         """
-       
-        phone_patterns = [
-            r'\b\+?90?\s*\(?5\d{2}\)?\s*\d{3}\s*\d{2}\s*\d{2}\b',  
-            r'\b\+?90?\s*\(?[1-9]\d{2}\)?\s*\d{3}\s*\d{2}\s*\d{2}\b',  
-        ]
-        for pattern in phone_patterns:
-            text = re.sub(pattern, '[TELEFON]', text)
-        return text
+        text = self._replace_rule("telefon_gsm", text)
+        return self._replace_rule("telefon", text)
 
     def anonymize_tckn(self, text):
         """
         Metindeki TC Kimlik numaralarını anonimleştirir.
         """
-        return re.sub(r'\b\d{11}\b', '[TCKN]', text)
+        return self._replace_rule("tckn", text)
+
+    def anonymize_patterns(self, text):
+        """
+        Tüm desen kurallarını (e-posta, telefon, TCKN, ORCID, ...) tek geçişte uygular.
+        """
+        return self._scanner.sub(lambda m: self._replacements[m.lastgroup], text)
+
+    def _entity_names(self, doc):
+        return {
+            ent.text for ent in doc.ents
+            # PER ve PERSON: Kişi, ORG: Kurum; tamamen büyük harfli kısaltmalar korunur
+            if ent.label_ in {"PER", "PERSON", "ORG"} and not ent.text.isupper()
+        }
+
+    def _entity_matcher(self, names):
+        """
+        Bulunan tüm isimler için tek bir eşleştirici derler. Uzun isimler önce
+        denenir ("Ahmet Yılmaz", "Ahmet"ten önce); metin bir kez taranır.
+        """
+        if not names:
+            return None
+        alternation = "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+        return re.compile(r'\b(?:' + alternation + r')\b')
 
     def anonymize_entities(self, text):
         """
         Metindeki kişi ve kurum isimlerini anonimleştirir.
         """
-        doc = self.nlp(text)
-        new_text = text
-        for ent in doc.ents:
-            if ent.label_ in {"PER", "PERSON", "ORG"}:  # PER ve PERSON: Kişi, ORG: Kurum
-                if not ent.text.isupper():  # Tamamen büyük harfli kelimeleri (kısaltmaları) koru
-                    new_text = re.sub(r'\b' + re.escape(ent.text) + r'\b', '', new_text)
-        return new_text
+        matcher = self._entity_matcher(self._entity_names(self.nlp(text)))
+        return matcher.sub('', text) if matcher else text
+
+    def _regex_spans(self, text):
+        return [
+            (match.start(), match.end(), self._replacements[match.lastgroup])
+            for match in self._scanner.finditer(text)
+        ]
+
+    def _entity_spans(self, text, doc):
+        # anonymize_entities gibi ismin metindeki tüm geçişleri silinir
+        matcher = self._entity_matcher(self._entity_names(doc))
+        if not matcher:
+            return []
+        return [(match.start(), match.end(), '') for match in matcher.finditer(text)]
+
+    def find_sensitive_spans(self, texts, batch_size=32):
+        """
+        Birden çok metni (ör. PDF sayfalarını) tek seferde tarar. NER modeli
+        nlp.pipe ile toplu çalışır; her metin için sıralı ve çakışmayan
+        (başlangıç, bitiş, yerine_gelecek_metin) aralıklarının listesi döner.
+        """
+        print(f"[INFO][anonymizer.py]: Scanning {len(texts)} texts for sensitive spans.")
+        results = []
+        for text, doc in zip(texts, self.nlp.pipe(texts, batch_size=batch_size)):
+            spans = sorted(self._regex_spans(text) + self._entity_spans(text, doc))
+            merged = []
+            for start, end, replacement in spans:
+                if merged and start < merged[-1][1]:
+                    prev_start, prev_end, prev_replacement = merged[-1]
+                    merged[-1] = (prev_start, max(prev_end, end), prev_replacement)
+                else:
+                    merged.append((start, end, replacement))
+            results.append(merged)
+        return results
 
     def anonymize(self, text):
         """
         Metindeki tüm hassas bilgileri anonimleştirir.
         """
         print("[INFO][anonymizer.py]: Starting anonymization process.")
-        text = self.anonymize_email(text)
-        text = self.anonymize_phone(text)
-        text = self.anonymize_tckn(text)
+        text = self.anonymize_patterns(text)
         text = self.anonymize_entities(text)
         print("[INFO][anonymizer.py]: Anonymization process completed.")
         return text
 
 
+_anonymizer = None
+_anonymizer_lock = threading.Lock()
+
+def get_anonymizer():
+    """Süreç genelinde paylaşılan Anonymizer örneğini döndürür (thread-safe)."""
+    global _anonymizer
+    if _anonymizer is None:
+        with _anonymizer_lock:
+            if _anonymizer is None:
+                _anonymizer = Anonymizer()
+    return _anonymizer
+
+def warm_up():
+    """Paylaşılan Anonymizer'ın NER modelini önceden yükler."""
+    return get_anonymizer().warm_up()
+
+
 # Örnek kullanım
 if __name__ == "__main__":
     anonymizer = Anonymizer()
@@ -1,14 +1,29 @@
-from flask import Flask, send_from_directory, redirect, make_response, request, jsonify, send_file
+import time
+APP_START = time.perf_counter()
+
+from flask import Flask, make_response, request, jsonify
 from flask_cors import CORS
 import os
-from datetime import datetime
+import hashlib
+from datetime import datetime, timedelta
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
 from io import BytesIO
-from pdf_isleme import PDFProcessor
-from database import Database
-import sqlite3
+from database import Database, timestamp, STATUS_PROCESSING
+from job_queue import JobQueue
+from anonymization_cache import AnonymizationCache
+from worker import STATUS_WAITING, PIPELINE_VERSION, WORKER_ACTIVE_SECONDS
+from upload_stream import StreamingRequest, UploadRejected
+from pdf_serving import send_pdf, send_immutable_file
+from previews import PreviewCache, FORMATS, THUMBNAIL_WIDTH, DEFAULT_FORMAT, MIN_WIDTH, MAX_WIDTH
+from storage import ContentStore
+from static_assets import StaticAssets
+from responses import list_response
 
 app = Flask(__name__, static_folder='../frontend')
+app.config.from_pyfile('config.py')
+# Yüklemeler bellekte tutulmadan doğrudan diske akıtılır
+app.request_class = StreamingRequest
 
 # CORS ayarlarını güncelle
 CORS(app, resources={
@@ -20,24 +35,39 @@ CORS(app, resources={
     }
 })
 
-# Veritabanı bağlantısı
+# Veritabanı bağlantısı (istek başına havuzdan tek bağlantı)
 db = Database()
+db.init_app(app)
+job_queue = JobQueue(db.db_path)
 
 # Klasör yapılandırmaları
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
-OUTPUT_FOLDER = os.path.join(BASE_DIR, 'outputs')
 PDF_STORAGE = os.path.join(BASE_DIR, 'pdf_storage')
 
+# Anonim PDF'ler içerik özetine göre parçalanmış klasörlerde tutulur
+pdf_store = ContentStore(PDF_STORAGE)
+preview_cache = PreviewCache()
+
+# Frontend; dağıtımdan önce scripts/build_assets.py ile derlenir
+static_assets = StaticAssets(os.path.abspath(os.path.join(BASE_DIR, '..', '..', 'frontend')))
+anonymization_cache = AnonymizationCache(db.db_path, content_store=pdf_store)
+
 # İzin verilen dosya uzantıları
 ALLOWED_EXTENSIONS = {'pdf'}
 
 # Klasörleri oluştur
-for folder in [UPLOAD_FOLDER, OUTPUT_FOLDER, PDF_STORAGE]:
+for folder in [UPLOAD_FOLDER, PDF_STORAGE]:
     if not os.path.exists(folder):
         os.makedirs(folder)
         print(f"Klasör oluşturuldu: {folder}")
 
+app.config['UPLOAD_STREAM_FOLDER'] = UPLOAD_FOLDER
+
+# Uygulama başlatma süresi (import + veritabanı + klasörler); gerilemeleri izlemek için
+STARTUP_SECONDS = time.perf_counter() - APP_START
+print(f"[INFO] Uygulama başlatma süresi: {STARTUP_SECONDS:.3f} sn")
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -45,6 +75,16 @@ def allowed_file(filename):
 def upload_article():
     try:
         print("[INFO] Makale yükleme isteği alındı")
+
+        # Gövde burada okunur; boyut ve PDF başlığı akış sırasında denetlenir
+        try:
+            request.files
+        except UploadRejected as e:
+            print(f"[ERROR] Yükleme reddedildi: {e.message}")
+            return jsonify({"message": e.message}), e.status_code
+        except RequestEntityTooLarge as e:
+            return request_entity_too_large(e)
+
         print("[INFO] Form verileri:", request.form)
         print("[INFO] Dosya verileri:", request.files)
 
@@ -67,97 +107,202 @@ def upload_article():
         if not allowed_file(pdf_file.filename):
             return jsonify({"message": "Sadece PDF dosyaları kabul edilmektedir"}), 400
 
+        upload = pdf_file.stream
+        if not upload.is_pdf:
+            return jsonify({"message": "Dosya geçerli bir PDF değil"}), 400
+
         # Dosya yollarını tanımla
         original_filename = secure_filename(pdf_file.filename)
-        original_path = os.path.join(UPLOAD_FOLDER, original_filename)
-        processed_filename = f"processed_{original_filename}"
+        content_hash = upload.sha256
+        # Geçici dosya adı yüklemeye özeldir; aynı adlı eşzamanlı yüklemeler çakışmaz
+        original_path = os.path.splitext(upload.path)[0] + '.pdf'
         anonymized_filename = f"anonymized_{original_filename}"
-        processed_path = os.path.join(OUTPUT_FOLDER, processed_filename)
-        anonymized_path = os.path.join(PDF_STORAGE, anonymized_filename)
 
         try:
-            # Orijinal PDF'i kaydet
-            pdf_file.save(original_path)
-            print(f"[INFO] Orijinal PDF kaydedildi: {original_path}")
-
-            # PDF'i işle
-            processor = PDFProcessor(original_path, processed_path)
-            processor.blur_images()
-            processor.save()
-            print(f"[INFO] İşlenmiş PDF kaydedildi: {processed_path}")
-
-            # PDF'i anonimleştir
-            processor = PDFProcessor(processed_path, anonymized_path)
-            processor.anonymize_pdf()
-            processor.save()
-            print(f"[INFO] Anonimleştirilmiş PDF kaydedildi: {anonymized_path}")
-
-            # Database column debug info
-            with sqlite3.connect(db.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("PRAGMA table_info(articles)")
-                columns = [column[1] for column in cursor.fetchall()]
-                print(f"[DEBUG] Available columns in articles table before insert: {columns}")
-
-            # Makaleyi veritabanına kaydet ve takip kodu al
+            # Tamamlanan yüklemeyi .pdf uzantılı adına taşı
+            upload.move_to(original_path)
+            print(f"[INFO] Orijinal PDF kaydedildi: {original_path} ({upload.size} bayt, sha256={content_hash})")
+
+            # Aynı PDF daha önce anonimleştirildiyse sonucu yeniden kullan
+            cached_key = anonymization_cache.lookup(content_hash, PIPELINE_VERSION)
+            if cached_key:
+                os.remove(original_path)
+                tracking_code = db.add_article(
+                    title=title,
+                    keywords=keywords,
+                    institution=institution,
+                    original_filename=original_filename,
+                    anonymized_filename=anonymized_filename,
+                    file_path=cached_key,
+                    status=STATUS_WAITING
+                )
+                if not tracking_code:
+                    raise Exception("Makale veritabanına kaydedilemedi")
+                print(f"[INFO] Önbellekten anonim PDF kullanıldı: {cached_key}")
+                return jsonify({
+                    "message": "Makale başarıyla yüklendi ve işlendi",
+                    "tracking_code": tracking_code,
+                    "status": "done"
+                }), 201
+
+            # PDF işleme arka planda worker tarafından yapılır; iş makaleyle aynı
+            # işlemde kuyruğa eklenir, böylece işi olmayan makale kalmaz
+            job_ids = []
+
+            def enqueue_job(cursor, article_id, tracking_code):
+                job_ids.append(job_queue.enqueue('anonymize_pdf', {
+                    'article_id': article_id,
+                    'original_path': original_path,
+                    'content_hash': content_hash
+                }, tracking_code=tracking_code, cursor=cursor))
+
+            # Makaleyi veritabanına kaydet ve takip kodu al; depo anahtarı
+            # (file_path) worker anonim PDF'i depoya yazınca atanır
             tracking_code = db.add_article(
                 title=title,
                 keywords=keywords,
                 institution=institution,
                 original_filename=original_filename,
                 anonymized_filename=anonymized_filename,
-                file_path=anonymized_path
+                file_path='',
+                status=STATUS_PROCESSING,
+                before_commit=enqueue_job
             )
-
-            # Başarılı işlem sonrası geçici dosyaları temizle
-            if os.path.exists(original_path):
-                os.remove(original_path)
-            if os.path.exists(processed_path):
-                os.remove(processed_path)
+            if not tracking_code:
+                raise Exception("Makale veritabanına kaydedilemedi")
+            job_id = job_ids[0]
 
             return jsonify({
-                "message": "Makale başarıyla yüklendi ve işlendi",
-                "tracking_code": tracking_code
-            }), 201
+                "message": "Makale başarıyla yüklendi, anonimleştirme işlemi devam ediyor",
+                "tracking_code": tracking_code,
+                "status": "processing",
+                "job_id": job_id
+            }), 202
 
         except Exception as e:
-            print(f"[ERROR] PDF işleme hatası: {str(e)}")
-            # Hata durumunda tüm geçici dosyaları temizle
-            for path in [original_path, processed_path]:
-                if os.path.exists(path):
-                    os.remove(path)
+            print(f"[ERROR] PDF kaydetme hatası: {str(e)}")
+            if os.path.exists(original_path):
+                os.remove(original_path)
             raise
 
     except Exception as e:
         print(f"[ERROR] Genel hata: {str(e)}")
         return jsonify({"message": f"Makale yüklenirken bir hata oluştu: {str(e)}"}), 500
 
+@app.teardown_request
+def discard_unused_uploads(exc):
+    # Kullanılmayan veya reddedilen yüklemelerin geçici dosyaları silinir
+    request.discard_uploads()
+
+@app.errorhandler(413)
+def request_entity_too_large(e):
+    max_mb = app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)
+    return jsonify({"message": f"Dosya boyutu sınırı aşıldı (en fazla {max_mb} MB)"}), 413
+
+@app.route('/api/jobs/<tracking_code>', methods=['GET'])
+def get_job_status(tracking_code):
+    """Makalenin arka plan işleme durumunu getirir"""
+    try:
+        job = job_queue.get_job_by_tracking_code(tracking_code)
+        if not job:
+            return jsonify({"message": "İş bulunamadı"}), 404
+        return jsonify(job)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@app.route('/api/health/ready', methods=['GET'])
+def readiness():
+    """NER modeli yüklü en az bir worker varsa hazırdır"""
+    try:
+        workers = job_queue.get_workers(WORKER_ACTIVE_SECONDS)
+        ready_workers = [w for w in workers if w['ready_at']]
+        return jsonify({
+            "ready": bool(ready_workers),
+            "ner_loaded": bool(ready_workers),
+            "workers": workers,
+            "startup_seconds": round(STARTUP_SECONDS, 3)
+        }), 200 if ready_workers else 503
+    except Exception as e:
+        return jsonify({"ready": False, "error": str(e)}), 503
+
+@app.route('/api/admin/cache-stats', methods=['GET'])
+def get_cache_stats():
+    """Anonimleştirme önbelleği isabet/ıska sayaçlarını getirir"""
+    try:
+        return jsonify(anonymization_cache.get_stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+# Makale listelerinde sayfa boyutu
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Arayüzde gösterilen durumların veritabanındaki karşılıkları
+STATUS_ALIASES = {
+    'Onaylandı': ['Onaylandı', 'Kabul Edildi'],
+    'Onaylanmadı': ['Onaylanmadı', 'Reddedildi'],
+}
+
+def page_limit():
+    """?limit= değerini okur (en fazla MAX_PAGE_SIZE); 1'den küçükse ValueError fırlatır"""
+    limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    if limit < 1:
+        raise ValueError("limit en az 1 olmalıdır")
+    return min(limit, MAX_PAGE_SIZE)
+
+def page_args():
+    """
+    Liste uç noktaları için ortak sorgu parametrelerini okur:
+    limit, cursor, sort (date_desc|date_asc), total=1, status (virgülle ayrılmış),
+    institution, date_from, date_to (YYYY-MM-DD), q (başlıkta arama).
+    Alan seçimi (fields) list_response içinde uygulanır.
+    Geçersiz değerlerde ValueError fırlatır.
+    """
+    limit = page_limit()
+    sort = request.args.get('sort', 'date_desc')
+    if sort not in ('date_desc', 'date_asc'):
+        raise ValueError("sort date_desc veya date_asc olmalıdır")
+    for name in ('date_from', 'date_to'):
+        if request.args.get(name):
+            datetime.strptime(request.args[name], '%Y-%m-%d')
+
+    statuses = []
+    for status in filter(None, request.args.get('status', '').split(',')):
+        statuses.extend(STATUS_ALIASES.get(status, [status]))
+
+    return {
+        'limit': limit,
+        'cursor': request.args.get('cursor') or None,
+        'sort': sort,
+        'include_total': request.args.get('total') in ('1', 'true'),
+        'status': statuses or None,
+        'institution': request.args.get('institution') or None,
+        'date_from': request.args.get('date_from') or None,
+        'date_to': request.args.get('date_to') or None,
+        'query': request.args.get('q') or None,
+    }
+
+@app.route('/api/admin/article-cache-stats', methods=['GET'])
+def get_article_cache_stats():
+    """Makale kayıt önbelleğinin isabet/ıska sayaçlarını getirir"""
+    return jsonify(db.article_cache.get_stats())
+
 @app.route('/api/articles', methods=['GET'])
 def get_articles():
     try:
-        articles = db.get_all_articles()
-        
-        # Ensure all dates are properly formatted
-        for article in articles:
-            if 'upload_date' in article and article['upload_date']:
-                # Ensure date is a string in ISO format
-                try:
-                    if isinstance(article['upload_date'], str):
-                        # Try to parse and reformat to ensure it's valid
-                        date_obj = datetime.strptime(article['upload_date'], '%Y-%m-%d %H:%M:%S')
-                        article['upload_date'] = date_obj.isoformat()
-                except Exception as e:
-                    print(f"Date conversion error: {e}")
-                    # Provide a fallback date if parsing fails
-                    article['upload_date'] = datetime.now().isoformat()
-            
+        page = db.get_all_articles(**page_args())
+
+        # Tarihler ISO biçiminde saklandığı için olduğu gibi döndürülür
+        for article in page['articles']:
             # Fix status consistency
             if article.get('status') == 'Kabul Edildi':
                 article['status'] = 'Onaylandı'
             elif article.get('status') == 'Reddedildi':
                 article['status'] = 'Onaylanmadı'
-                
-        return jsonify(articles)
+
+        return list_response(page, 'articles')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"[ERROR] Error fetching articles: {str(e)}")
         return jsonify({"error": f"Makaleler alınırken hata oluştu: {str(e)}"}), 500
@@ -169,11 +314,10 @@ def download_pdf(tracking_code):
         if not article:
             return jsonify({"message": "Makale bulunamadı"}), 404
         
-        return send_file(
-            article['file_path'],
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=article['anonymized_filename']
+        return send_pdf(
+            pdf_store.path(article['file_path']),
+            download_name=article['anonymized_filename'],
+            as_attachment=True
         )
     except Exception as e:
         return jsonify({"error": "PDF indirilirken hata oluştu"}), 500
@@ -185,14 +329,7 @@ def view_article(article_id):
         if not article:
             return jsonify({"message": "Makale bulunamadı"}), 404
             
-        file_path = article.get('file_path')
-        if not file_path or not os.path.exists(file_path):
-            return jsonify({"message": "Dosya bulunamadı"}), 404
-
-        return send_file(
-            file_path,
-            mimetype='application/pdf'
-        )
+        return send_pdf(pdf_store.path(article.get('file_path')))
     except Exception as e:
         return jsonify({"message": f"Dosya görüntülenirken hata oluştu: {str(e)}"}), 500
 
@@ -203,14 +340,7 @@ def view_article_for_reviewer(article_id):
         if not article:
             return jsonify({"message": "Makale bulunamadı"}), 404
             
-        file_path = article.get('file_path')
-        if not file_path or not os.path.exists(file_path):
-            return jsonify({"message": "Dosya bulunamadı"}), 404
-
-        return send_file(
-            file_path,
-            mimetype='application/pdf'
-        )
+        return send_pdf(pdf_store.path(article.get('file_path')))
     except Exception as e:
         return jsonify({"message": f"Dosya görüntülenirken hata oluştu: {str(e)}"}), 500
     
@@ -221,14 +351,41 @@ def view_pdf(tracking_code):
         if not article:
             return jsonify({"message": "Makale bulunamadı"}), 404
         
-        return send_file(
-            article['file_path'],
-            mimetype='application/pdf',
-            as_attachment=False
-        )
+        return send_pdf(pdf_store.path(article['file_path']))
     except Exception as e:
         return jsonify({"error": "PDF görüntülenirken hata oluştu"}), 500
 
+@app.route('/api/articles/<int:article_id>/preview/<int:page>', methods=['GET'])
+def article_page_preview(article_id, page):
+    """Anonim PDF'in bir sayfasını raster önizleme (WebP/PNG) olarak döndürür"""
+    try:
+        width = request.args.get('width', THUMBNAIL_WIDTH, type=int)
+        fmt = request.args.get('format', DEFAULT_FORMAT).lower()
+        if not MIN_WIDTH <= width <= MAX_WIDTH:
+            return jsonify({"error": f"width {MIN_WIDTH}-{MAX_WIDTH} arasında olmalıdır"}), 400
+        if fmt not in FORMATS:
+            return jsonify({"error": f"Geçersiz biçim: {fmt}"}), 400
+
+        article = db.get_article_by_id(article_id)
+        if not article:
+            return jsonify({"message": "Makale bulunamadı"}), 404
+
+        key = article.get('file_path')
+        pdf_path = pdf_store.path(key)
+        if not pdf_path or not os.path.exists(pdf_path):
+            return jsonify({"message": "Dosya bulunamadı"}), 404
+
+        try:
+            digest = ContentStore.digest(key)
+            path = preview_cache.get(pdf_path, digest, page, width, fmt)
+        except IndexError:
+            return jsonify({"message": "Sayfa bulunamadı"}), 404
+        # Önizleme içeriği adıyla belirlenir; dosyayı her istekte özetlemeye gerek yok
+        return send_immutable_file(path, FORMATS[fmt], etag=PreviewCache.name_for(digest, page, width, fmt))
+    except Exception as e:
+        print(f"[ERROR] Önizleme oluşturulamadı: {str(e)}")
+        return jsonify({"error": "Önizleme oluşturulurken hata oluştu"}), 500
+
 @app.route('/api/track/<tracking_code>', methods=['GET'])
 def track_article(tracking_code):
     """Makale takip"""
@@ -247,8 +404,18 @@ def track_article(tracking_code):
             "status": article['status'],
             "upload_date": article['upload_date'],
             "tracking_code": article['tracking_code'],
-            "reviews": reviews
+            "reviews": reviews,
+            "review_summary": db.get_review_tally(article['id'])
         }
+
+        # Arka plan işleme durumu
+        job = job_queue.get_job_by_tracking_code(tracking_code)
+        if job:
+            response["processing"] = {
+                "status": job['status'],
+                "attempts": job['attempts'],
+                "error": job['error']
+            }
         
         return jsonify(response)
     except Exception as e:
@@ -263,7 +430,7 @@ def reviewer_login():
         if not email:
             return jsonify({"message": "Email gerekli"}), 400
             
-        with sqlite3.connect(db.db_path) as conn:
+        with db.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM reviewers WHERE email = ?', (email,))
             reviewer = cursor.fetchone()
@@ -285,11 +452,54 @@ def reviewer_login():
 @app.route('/api/reviewer/articles/<email>', methods=['GET'])
 def get_reviewer_articles(email):
     try:
-        articles = db.get_articles_by_reviewer(email)
-        return jsonify(articles), 200
+        page = db.get_articles_by_reviewer(email, **page_args())
+        return list_response(page, 'articles')
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({"message": f"Makaleler alınırken bir hata oluştu: {str(e)}"}), 500
 
+@app.route('/api/reviewer/dashboard/<email>', methods=['GET'])
+def get_reviewer_dashboard(email):
+    """
+    Hakem paneli: bekleyen/tamamlanan/gecikmiş sayıları ve bekleyen makalelerin
+    ilk sayfası (limit, cursor). Yanıt ETag taşır; If-None-Match eşleşirse
+    liste sorgusu çalıştırılmadan 304 döner.
+    """
+    try:
+        limit = page_limit()
+        cursor = request.args.get('cursor') or None
+        due_days = app.config.get('REVIEW_DUE_DAYS', 14)
+        due_before = timestamp(datetime.now() - timedelta(days=due_days))
+
+        state = db.get_reviewer_dashboard_state(email, due_before)
+        etag = hashlib.sha1(
+            f"{email}|{state['version']}|{state['overdue']}|{limit}|{cursor}".encode()
+        ).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = make_response('', 304)
+        else:
+            page = db.get_reviewer_pending_articles(email, limit=limit, cursor=cursor)
+            response = jsonify({
+                "reviewer_email": email,
+                "counts": {
+                    "pending": state['pending'],
+                    "completed": state['completed'],
+                    "overdue": state['overdue'],
+                    "total": state['pending'] + state['completed']
+                },
+                "due_days": due_days,
+                "pending": page
+            })
+        response.set_etag(etag)
+        # Tarayıcı her seferinde ETag ile doğrulasın
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+    except Exception as e:
+        return jsonify({"message": f"Hakem paneli alınırken bir hata oluştu: {str(e)}"}), 500
+
 @app.route('/api/reviewer/review', methods=['POST'])
 def submit_review_legacy():
     try:
@@ -348,7 +558,7 @@ def submit_review():
             return jsonify({"message": "Geçersiz makale ID"}), 400
 
         # Verify article exists
-        with sqlite3.connect(db.db_path) as conn:
+        with db.connect() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT id FROM articles WHERE id = ?", (article_id,))
             if not cursor.fetchone():
@@ -372,8 +582,10 @@ def submit_review():
 def get_unassigned_articles():
     """Henüz hakeme atanmamış makaleleri listeler"""
     try:
-        articles = db.get_unassigned_articles()
-        return jsonify(articles)
+        page = db.get_unassigned_articles(**page_args())
+        return list_response(page, 'articles')
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
     except Exception as e:
         return jsonify({"message": f"Makaleler alınırken bir hata oluştu: {str(e)}"}), 500
 
@@ -382,7 +594,7 @@ def get_reviewers():
     """Tüm hakemleri listeler"""
     try:
         reviewers = db.get_all_reviewers()
-        return jsonify(reviewers)
+        return list_response(reviewers)
     except Exception as e:
         return jsonify({"message": f"Hakemler alınırken bir hata oluştu: {str(e)}"}), 500
 
@@ -405,6 +617,33 @@ def assign_reviewer():
     except Exception as e:
         return jsonify({"message": f"Hakem atanırken bir hata oluştu: {str(e)}"}), 500
 
+@app.route('/api/admin/bulk-assign', methods=['POST'])
+def bulk_assign():
+    """
+    Toplu hakem ataması. Gövde ya çift listesi ya da kural içerir:
+      {"pairs": [{"article_id": 1, "reviewer_email": "a@b.com"}, ...]}
+      {"reviewer_emails": ["a@b.com"], "article_status": "Beklemede", "unassigned_only": true}
+    """
+    try:
+        data = request.get_json() or {}
+        if 'pairs' in data:
+            pairs = [(int(pair['article_id']), pair['reviewer_email']) for pair in data['pairs']]
+            result = db.bulk_assign(pairs=pairs)
+        else:
+            reviewer_emails = data.get('reviewer_emails') or ([data['reviewer_email']] if data.get('reviewer_email') else [])
+            if not reviewer_emails:
+                return jsonify({"message": "pairs veya reviewer_emails gereklidir"}), 400
+            result = db.bulk_assign(
+                reviewer_emails=reviewer_emails,
+                article_status=data.get('article_status'),
+                unassigned_only=bool(data.get('unassigned_only'))
+            )
+        return jsonify(result), 200
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"message": f"Geçersiz atama isteği: {str(e)}"}), 400
+    except Exception as e:
+        return jsonify({"message": f"Toplu atama yapılırken bir hata oluştu: {str(e)}"}), 500
+
 @app.route('/api/admin/add-test-reviewer', methods=['POST'])
 def add_test_reviewer():
     """Test hakemi ekler"""
@@ -456,14 +695,8 @@ def reject_article(article_id):
 @app.route('/api/admin/reset-assignments', methods=['POST'])
 def reset_assignments():
     try:
-        with sqlite3.connect(db.db_path) as conn:
-            cursor = conn.cursor()
-            # Mevcut atamaları temizle
-            cursor.execute('DELETE FROM article_reviewers')
-            conn.commit()
-        
-        # Yeniden ata
-        success = db.add_test_reviewer()
+        # Mevcut atamaları temizle ve yeniden ata (tek işlem)
+        success = db.add_test_reviewer(reset=True)
         if success:
             return jsonify({'message': 'Makale atamaları başarıyla sıfırlandı ve yeniden atandı'}), 200
         else:
@@ -494,55 +727,38 @@ def get_article_by_id(article_id):
             response.headers['Content-Type'] = 'application/json'
             return response
             
-        # If not found in db, use sample data for testing
-        with sqlite3.connect(db.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT a.*, ar.status as review_status
-                FROM articles a
-                LEFT JOIN article_reviewers ar ON a.id = ar.article_id
-                WHERE a.id = ?
-            ''', (article_id,))
-            article = cursor.fetchone()
-            
-            if article:
-                response = jsonify(dict(article))
-                response.headers['Content-Type'] = 'application/json'
-                return response
-                
-            # No article found, return sample data
-            print(f"[INFO] No article found in DB with id {article_id}, returning sample data")
-            
-            sample_data = {
-                'id': article_id,
-                'title': f'Test Makale {article_id}',
-                'author': 'Dr. Test Yazar',
-                'institution': 'Test Üniversitesi',
-                'email': 'test@example.com',
-                'abstract': 'Bu bir test makalesidir. Makalenin özeti burada görüntülenecektir.',
-                'keywords': 'test, örnek, anahtar kelimeler',
-                'status': 'Onaylandı',
-                'upload_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                'tracking_code': f'TST-{article_id}',
-                'reviewers': [
-                    {'name': 'Hakem 1', 'email': 'hakem1@example.com'},
-                    {'name': 'Hakem 2', 'email': 'hakem2@example.com'}
-                ],
-                'reviews': [
-                    {
-                        'reviewer_name': 'Hakem 1',
-                        'decision': 'accept',
-                        'comments': 'Makale kabul edilebilir durumdadır.',
-                        'review_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                ]
-            }
-            
-            response = jsonify(sample_data)
-            response.headers['Content-Type'] = 'application/json'
-            return response
-            
+        # No article found, return sample data for testing
+        print(f"[INFO] No article found in DB with id {article_id}, returning sample data")
+        
+        sample_data = {
+            'id': article_id,
+            'title': f'Test Makale {article_id}',
+            'author': 'Dr. Test Yazar',
+            'institution': 'Test Üniversitesi',
+            'email': 'test@example.com',
+            'abstract': 'Bu bir test makalesidir. Makalenin özeti burada görüntülenecektir.',
+            'keywords': 'test, örnek, anahtar kelimeler',
+            'status': 'Onaylandı',
+            'upload_date': timestamp(),
+            'tracking_code': f'TST-{article_id}',
+            'reviewers': [
+                {'name': 'Hakem 1', 'email': 'hakem1@example.com'},
+                {'name': 'Hakem 2', 'email': 'hakem2@example.com'}
+            ],
+            'reviews': [
+                {
+                    'reviewer_name': 'Hakem 1',
+                    'decision': 'accept',
+                    'comments': 'Makale kabul edilebilir durumdadır.',
+                    'review_date': timestamp()
+                }
+            ]
+        }
+        
+        response = jsonify(sample_data)
+        response.headers['Content-Type'] = 'application/json'
+        return response
+        
     except Exception as e:
         print(f"[ERROR] Error getting article details: {str(e)}")
         error_response = jsonify({"error": f"Makale detayları alınırken hata oluştu: {str(e)}"})
@@ -553,21 +769,14 @@ def get_article_by_id(article_id):
 def get_article_reviewers_fallback(article_id):
     """Makaleye atanmış hakemleri getirir (fallback test data)"""
     try:
-        # First try to get actual data
-        with sqlite3.connect(db.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT r.name, r.email
-                FROM article_reviewers ar
-                JOIN reviewers r ON ar.reviewer_email = r.email
-                WHERE ar.article_id = ?
-            ''', (article_id,))
-            
-            reviewers = [dict(row) for row in cursor.fetchall()]
-            
-            if reviewers:
-                return jsonify(reviewers)
+        # Makale detayıyla aynı tek sorgulu (ve önbellekli) sonuçtan
+        article = db.get_article_by_id(article_id)
+        reviewers = [
+            {'name': reviewer['name'], 'email': reviewer['email']}
+            for reviewer in (article or {}).get('reviewers', [])
+        ]
+        if reviewers:
+            return jsonify(reviewers)
                 
         # If no data, return sample
         sample_reviewers = [
@@ -584,27 +793,14 @@ def get_article_reviewers_fallback(article_id):
 def get_article_reviews_fallback(article_id):
     """Makaleye ait değerlendirmeleri ID ile getirir (fallback test data)"""
     try:
-        # First try to get actual data
-        with sqlite3.connect(db.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            
-            # Değerlendirmeleri getir
-            cursor.execute('''
-                SELECT ar.decision, ar.comments, ar.review_date, r.name as reviewer_name
-                FROM article_reviewers ar
-                JOIN reviewers r ON ar.reviewer_email = r.email
-                WHERE ar.article_id = ? AND ar.status = 'Tamamlandı'
-                ORDER BY ar.review_date DESC
-            ''', (article_id,))
-            
-            reviews = [dict(row) for row in cursor.fetchall()]
-            
-            if reviews:
-                return jsonify(reviews)
+        # Makale detayıyla aynı tek sorgulu (ve önbellekli) sonuçtan
+        article = db.get_article_by_id(article_id)
+        reviews = (article or {}).get('reviews', [])
+        if reviews:
+            return jsonify(reviews)
                 
         # If no data, return sample
-        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        now = timestamp()
         sample_reviews = [
             {
                 'reviewer_name': 'Dr. Ali Yılmaz',
@@ -626,38 +822,22 @@ def download_article(article_id):
         if not article:
             return jsonify({"message": "Makale bulunamadı"}), 404
             
-        file_path = article.get('file_path')
-        if not file_path or not os.path.exists(file_path):
-            return jsonify({"message": "Dosya bulunamadı"}), 404
-
-        return send_file(
-            file_path,
-            as_attachment=True,
+        return send_pdf(
+            pdf_store.path(article.get('file_path')),
             download_name=f"makale_{article_id}.pdf",
-            mimetype='application/pdf'
+            as_attachment=True
         )
     except Exception as e:
         return jsonify({"message": f"Dosya indirilirken hata oluştu: {str(e)}"}), 500
 
-# Frontend dosyalarını sunmak için route'lar
+# Frontend dosyalarını sunmak için route'lar (derlenmiş dist/ varsa oradan)
 @app.route('/')
 def index():
-    return send_from_directory('../../frontend/pages', 'index.html')
+    return static_assets.send('index.html')
 
 @app.route('/<path:path>')
 def serve_pages(path):
-    try:
-        if path.startswith('js/'):
-            return send_from_directory('../../frontend', path)
-        elif path.startswith('css/'):
-            return send_from_directory('../../frontend', path)
-        elif path.endswith('.html'):
-            return send_from_directory('../../frontend/pages', path)
-        else:
-            return send_from_directory('../../frontend', path)
-    except Exception as e:
-        print(f"[ERROR]: {str(e)}")
-        return redirect('/')
+    return static_assets.send(path)
 
 if __name__ == "__main__":
     app.run(debug=True, port=5000)
@@ -0,0 +1,76 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+class ArticleCache:
+    """Makale kayıtları için süreç içi LRU + TTL önbellek.
+
+    Kayıtlar ('id', article_id) ve ('tracking', tracking_code) anahtarlarıyla
+    tutulur; invalidate(article_id) o makaleye ait tüm anahtarları siler.
+    Başka bir süreçte (worker) yapılan değişiklikler buraya ulaşmaz; bu
+    yüzden kayıtlar en fazla ttl_seconds kadar yaşar.
+    """
+
+    def __init__(self, max_entries=512, ttl_seconds=30):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._keys_by_article = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+    def get(self, key):
+        """Kaydın kopyasını döndürür; yoksa veya süresi dolduysa None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                # Çağıranlar sonucu değiştirebilir (ör. durum normalizasyonu)
+                return copy.deepcopy(entry[2])
+            if entry:
+                self._remove(key)
+            self._stats['misses'] += 1
+            return None
+
+    def set(self, key, article_id, value):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, article_id, copy.deepcopy(value))
+            self._keys_by_article.setdefault(article_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def invalidate(self, article_id):
+        """Makaleye ait tüm önbellek kayıtlarını siler"""
+        with self._lock:
+            keys = self._keys_by_article.pop(article_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            if keys:
+                self._stats['invalidations'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._stats['invalidations'] += len(self._keys_by_article)
+            self._entries.clear()
+            self._keys_by_article.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['max_entries'] = self.max_entries
+            stats['ttl_seconds'] = self.ttl_seconds
+            return stats
+
+    def _remove(self, key):
+        _, article_id, _ = self._entries.pop(key)
+        keys = self._keys_by_article.get(article_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_article[article_id]
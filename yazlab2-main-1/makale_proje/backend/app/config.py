@@ -13,6 +13,9 @@ MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max dosya boyutu
 
 ALLOWED_EXTENSIONS = {'pdf'}
 
+# Hakem değerlendirme süresi (gün); aşılan atamalar gecikmiş sayılır
+REVIEW_DUE_DAYS = 14
+
 
 # Mail sunucusu ayarları
 MAIL_SERVER = 'smtp.gmail.com'
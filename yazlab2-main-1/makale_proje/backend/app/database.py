@@ -1,95 +1,144 @@
 import sqlite3
 import os
+import json
+import base64
+import queue
+import threading
 from datetime import datetime
+from flask import g, has_request_context
+from article_cache import ArticleCache
+
+# Her yeni bağlantıda uygulanan ayarlar. journal_mode=WAL okuyucuların
+# yazıcıyı beklemesini önler; synchronous=NORMAL WAL ile güvenlidir.
+CONNECTION_PRAGMAS = [
+    'PRAGMA busy_timeout=30000',     # kilit için en fazla 30 sn beklenir (ilk ayar; WAL geçişi de bekler)
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-20000',      # ~20 MB sayfa önbelleği
+    'PRAGMA mmap_size=268435456',    # 256 MB bellek eşlemeli okuma
+    'PRAGMA temp_store=MEMORY',
+]
+
+class ConnectionPool:
+    """Aynı veritabanı dosyası için yeniden kullanılan SQLite bağlantıları."""
+
+    def __init__(self, db_path, size=8):
+        self.db_path = db_path
+        self.size = size
+        self._idle = queue.LifoQueue()
+
+    def _create(self):
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._create()
+
+    def release(self, conn):
+        # Yarım kalan işlem bir sonraki isteğe taşınmasın
+        if conn.in_transaction:
+            conn.rollback()
+        if self._idle.qsize() < self.size:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+_pools = {}
+_pools_lock = threading.Lock()
+_thread_local = threading.local()
+
+def get_pool(db_path):
+    with _pools_lock:
+        if db_path not in _pools:
+            _pools[db_path] = ConnectionPool(db_path)
+        return _pools[db_path]
+
+def get_connection(db_path):
+    """
+    Kullanılacak bağlantıyı döndürür. Flask isteği içinde istek boyunca tek bir
+    havuz bağlantısı paylaşılır (istek sonunda havuza döner); istek dışında
+    (worker, script) her thread kendi kalıcı bağlantısını kullanır.
+    """
+    if has_request_context():
+        conns = g.setdefault('_db_connections', {})
+        if db_path not in conns:
+            conns[db_path] = get_pool(db_path).acquire()
+        return conns[db_path]
+
+    conns = getattr(_thread_local, 'connections', None)
+    if conns is None:
+        conns = _thread_local.connections = {}
+    if db_path not in conns:
+        conns[db_path] = get_pool(db_path)._create()
+    return conns[db_path]
+
+def release_request_connections(exc=None):
+    """İstek boyunca kullanılan bağlantıları havuza iade eder (teardown)."""
+    for db_path, conn in g.pop('_db_connections', {}).items():
+        get_pool(db_path).release(conn)
+
+# Zaman damgaları ISO-8601 metin (YYYY-MM-DDTHH:MM:SS) olarak saklanır: metin
+# sırası zaman sırasıyla aynıdır, indekslenebilir ve API'de dönüştürülmeden döner.
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+def timestamp(dt=None):
+    """Verilen (varsayılan: şimdiki) zamanı saklama biçiminde döndürür"""
+    return (dt or datetime.now()).strftime(TIMESTAMP_FORMAT)
+
+def encode_cursor(upload_date, article_id):
+    """Sayfanın son satırından bir sonraki sayfa imlecini üretir"""
+    raw = json.dumps([upload_date, article_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token):
+    """encode_cursor çıktısını (upload_date, id) olarak çözer; geçersizse ValueError"""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        upload_date, article_id = json.loads(raw)
+        return str(upload_date), int(article_id)
+    except Exception:
+        raise ValueError("Geçersiz sayfa imleci")
+
+# Arka planda anonimleştirilen makale; dosyası yoktur ve hakemlere henüz atanmaz
+STATUS_PROCESSING = 'İşleniyor'
+
+# Bu durumdaki makaleler başka süreçte (worker) güncellendiği için önbelleğe alınmaz
+UNCACHED_STATUSES = {STATUS_PROCESSING}
+
+# Liste sorgularında dönen makale sütunları; depo anahtarı (file_path) ve
+# özgün dosya adı sadece tek makale sorgularında döner
+ARTICLE_LIST_COLUMNS = '''a.id, a.title, a.keywords, a.institution, a.tracking_code,
+                   a.anonymized_filename, a.upload_date, a.status'''
 
 class Database:
     def __init__(self):
         self.db_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'makale.db')
+        # get_article_by_id / get_article_by_tracking_code sonuçları
+        self.article_cache = ArticleCache()
         self.init_db()
 
+    def init_app(self, app):
+        """İstek kapsamlı bağlantıların istek sonunda havuza dönmesini sağlar."""
+        app.teardown_request(release_request_connections)
+
+    def connect(self):
+        """Havuzdan bağlantı döndürür; `with db.connect() as conn:` ile işlem yönetilir."""
+        return get_connection(self.db_path)
+
     def init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Makaleler tablosu
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS articles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    title TEXT NOT NULL,
-                    keywords TEXT,
-                    institution TEXT,
-                    tracking_code TEXT UNIQUE NOT NULL,
-                    file_path TEXT NOT NULL,
-                    anonymized_filename TEXT,
-                    original_filename TEXT,
-                    upload_date TIMESTAMP,
-                    status TEXT DEFAULT 'Beklemede'
-                )
-            ''')
-            
-            # Check if original_filename column exists, if not add it
-            cursor.execute("PRAGMA table_info(articles)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'original_filename' not in columns:
-                print("[INFO] Adding original_filename column to articles table")
-                cursor.execute("ALTER TABLE articles ADD COLUMN original_filename TEXT")
-            
-            # Hakemler tablosu
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS reviewers (
-                    name TEXT NOT NULL,
-                    email TEXT PRIMARY KEY,
-                    created_at TIMESTAMP
-                )
-            ''')
-            
-            # Makale-Hakem ilişki tablosu
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS article_reviewers (
-                    article_id INTEGER,
-                    reviewer_email TEXT,
-                    assigned_date TIMESTAMP,
-                    status TEXT DEFAULT 'Beklemede',
-                    decision TEXT,
-                    comments TEXT,
-                    review_date TIMESTAMP,
-                    PRIMARY KEY (article_id, reviewer_email),
-                    FOREIGN KEY (article_id) REFERENCES articles (id),
-                    FOREIGN KEY (reviewer_email) REFERENCES reviewers (email)
-                )
-            ''')
-            
-            # Değerlendirmeler tablosu
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS reviews (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    article_id INTEGER,
-                    reviewer_email TEXT,
-                    decision TEXT,
-                    comments TEXT,
-                    review_date TIMESTAMP,
-                    FOREIGN KEY (article_id) REFERENCES articles (id),
-                    FOREIGN KEY (reviewer_email) REFERENCES reviewers (email)
-                )
-            ''')
-            
-            # Kullanıcılar tablosu
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    password TEXT NOT NULL,
-                    role TEXT NOT NULL,
-                    created_at TIMESTAMP
-                )
-            ''')
-            
-            conn.commit()
+        """Bekleyen şema migration'larını uygular (bkz. migrations.py)"""
+        # migrations modülü get_connection'ı bu modülden aldığı için burada içe aktarılır
+        from migrations import ensure_schema
+        ensure_schema(self.db_path)
 
     def verify_reviewer_access(self, article_id, reviewer_email):
-        with sqlite3.connect(self.db_path) as conn:
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
                 SELECT 1 FROM article_reviewers 
@@ -97,41 +146,35 @@ class Database:
             ''', (article_id, reviewer_email))
             return cursor.fetchone() is not None
     
-    def generate_tracking_code(self):
-        """Benzersiz takip kodu oluşturur"""
-        current_time = datetime.now()
+    def generate_tracking_code(self, cursor):
+        """
+        Benzersiz takip kodu ayırır. add_article'ın açık işlemi içinde çağrılır:
+        günlük sayaç satırı güncellendiği anda yazma kilidi alınır, böylece
+        eşzamanlı yüklemeler aynı numarayı alamaz ve articles taranmaz.
+        """
         # Format: MKL-YYYYMMDD-XXXX (MKL: Makale, XXXX: Sıralı numara)
-        base_code = f"MKL-{current_time.strftime('%Y%m%d')}"
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            # Bugün oluşturulan son kodu bul
-            cursor.execute(
-                "SELECT tracking_code FROM articles WHERE tracking_code LIKE ? ORDER BY id DESC LIMIT 1", 
-                (f"{base_code}%",)
-            )
-            last_code = cursor.fetchone()
-            
-            if last_code:
-                last_number = int(last_code[0][-4:])
-                new_number = str(last_number + 1).zfill(4)
-            else:
-                new_number = "0001"
-                
-            return f"{base_code}-{new_number}"
+        day = datetime.now().strftime('%Y%m%d')
+        cursor.execute('''
+            INSERT INTO tracking_counters (day, last_number) VALUES (?, 1)
+            ON CONFLICT(day) DO UPDATE SET last_number = last_number + 1
+        ''', (day,))
+        cursor.execute('SELECT last_number FROM tracking_counters WHERE day = ?', (day,))
+        new_number = str(cursor.fetchone()[0]).zfill(4)
+        return f"MKL-{day}-{new_number}"
 
-    def add_article(self, title, keywords, institution, original_filename, anonymized_filename, file_path):
-        """Yeni makale ekler ve takip kodunu döndürür"""
-        tracking_code = self.generate_tracking_code()
-        
+    def add_article(self, title, keywords, institution, original_filename, anonymized_filename, file_path, status='Beklemede', before_commit=None):
+        """Yeni makale ekler ve takip kodunu döndürür.
+
+        before_commit(cursor, article_id, tracking_code) verilirse aynı işlemde
+        çalışır (ör. işleme işinin kuyruğa eklenmesi); hata fırlatırsa makale de
+        eklenmez.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect() as conn:
                 cursor = conn.cursor()
-                # Check if the articles table has the necessary columns
-                cursor.execute("PRAGMA table_info(articles)")
-                columns = [column[1] for column in cursor.fetchall()]
-                print(f"[DEBUG] Available columns in articles table: {columns}")
-                
+                # Takip kodu makale ile aynı işlemde ayrılır
+                tracking_code = self.generate_tracking_code(cursor)
+
                 # Makaleyi ekle
                 cursor.execute('''
                     INSERT INTO articles (
@@ -142,30 +185,19 @@ class Database:
                 ''', (
                     title, tracking_code, keywords, institution,
                     original_filename, anonymized_filename,
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    file_path, 'Beklemede'
+                    timestamp(),
+                    file_path, status
                 ))
                 
                 # Yeni eklenen makalenin ID'sini al
                 article_id = cursor.lastrowid
                 
-                # Tüm hakemleri al
-                cursor.execute('SELECT email FROM reviewers')
-                reviewers = cursor.fetchall()
-                
-                # Makaleyi tüm hakemlere ata
-                current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                for reviewer in reviewers:
-                    cursor.execute('''
-                        INSERT INTO article_reviewers 
-                        (article_id, reviewer_email, assigned_date, status)
-                        VALUES (?, ?, ?, ?)
-                    ''', (
-                        article_id,
-                        reviewer[0],  # reviewer email
-                        current_time,
-                        'Beklemede'
-                    ))
+                # İşlenen makale hakemlere worker bitirince atanır (bkz. finish_processing)
+                if status != STATUS_PROCESSING:
+                    self._assign_to_all_reviewers(cursor, article_id)
+
+                if before_commit:
+                    before_commit(cursor, article_id, tracking_code)
                 
                 conn.commit()
                 print(f"[INFO] Yeni makale eklendi ve hakemlere atandı: {tracking_code}")
@@ -175,18 +207,58 @@ class Database:
             print(f"[HATA] Makale eklenirken hata: {str(e)}")
             return None
 
+    def _assign_to_all_reviewers(self, cursor, article_id):
+        """Makaleyi tüm hakemlere atar (tek executemany)"""
+        cursor.execute('SELECT email FROM reviewers')
+        self._insert_assignments(cursor, [(article_id, row[0]) for row in cursor.fetchall()])
+
+    def finish_processing(self, cursor, article_id, file_path, status='Beklemede'):
+        """
+        Anonimleştirmesi biten makalenin depo anahtarını ve durumunu yazar ve
+        makaleyi hakemlere atar. Çağıranın işleminde çalışır (worker bunu işin
+        tamamlanmasıyla aynı işlemde yapar); önbellek commit sonrası
+        article_cache.invalidate ile temizlenmelidir.
+        """
+        cursor.execute('''
+            UPDATE articles SET status = ?, file_path = ?
+            WHERE id = ?
+        ''', (status, file_path, article_id))
+        if cursor.rowcount != 1:
+            raise ValueError(f"Makale bulunamadı: {article_id}")
+        self._assign_to_all_reviewers(cursor, article_id)
+
+    def fail_processing(self, cursor, article_id, status):
+        """
+        İşlenemeyen makalenin durumunu yazar (sadece hâlâ işleniyorsa).
+        Çağıranın işleminde çalışır; önbellek commit sonrası temizlenmelidir.
+        """
+        cursor.execute('''
+            UPDATE articles SET status = ?
+            WHERE id = ? AND status = ?
+        ''', (status, article_id, STATUS_PROCESSING))
+
+    def _cache_article(self, key, article):
+        if article and article.get('status') not in UNCACHED_STATUSES:
+            self.article_cache.set(key, article['id'], article)
+
     def get_article_by_tracking_code(self, tracking_code):
-        """Takip kodu ile makale bilgilerini getirir"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        """Takip kodu ile makale bilgilerini getirir (önbellekli)"""
+        key = ('tracking', tracking_code)
+        article = self.article_cache.get(key)
+        if article is not None:
+            return article
+
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM articles WHERE tracking_code = ?', (tracking_code,))
-            return dict(cursor.fetchone() or {})
+            article = dict(cursor.fetchone() or {})
+        self._cache_article(key, article)
+        return article
 
     def update_article_status(self, article_id: int, new_status: str) -> bool:
         """Makale durumunu günceller"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     UPDATE articles 
@@ -194,98 +266,179 @@ class Database:
                     WHERE id = ?
                 ''', (new_status, article_id))
                 conn.commit()
-                return True
+            self.article_cache.invalidate(int(article_id))
+            return True
         except Exception as e:
             print(f"[HATA] Makale durumu güncellenirken hata: {str(e)}")
             return False
     
     def get_article_by_id(self, article_id):
-        """ID ile makale bilgilerini getirir"""
+        """ID ile makale bilgilerini getirir (önbellekli)"""
+        key = ('id', article_id)
+        article = self.article_cache.get(key)
+        if article is not None:
+            return article
+
+        article = self._load_article_by_id(article_id)
+        self._cache_article(key, article)
+        return article
+
+    def _load_article_by_id(self, article_id):
+        """
+        Makaleyi hakemleri, tamamlanan değerlendirmeleri ve değerlendirme
+        sayaçlarıyla birlikte tek sorguda getirir (json_group_array).
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.connect() as conn:
                 cursor = conn.cursor()
-                
-                # Get basic article info
                 cursor.execute('''
-                    SELECT * FROM articles WHERE id = ?
+                    SELECT a.*,
+                        (
+                            SELECT json_group_array(json_object(
+                                'name', r.name, 'email', r.email, 'review_status', ar.status
+                            ))
+                            FROM article_reviewers ar
+                            JOIN reviewers r ON ar.reviewer_email = r.email
+                            WHERE ar.article_id = a.id
+                        ) AS reviewers_json,
+                        (
+                            SELECT json_group_array(json_object(
+                                'decision', rv.decision, 'comments', rv.comments,
+                                'review_date', rv.review_date, 'reviewer_name', rv.reviewer_name
+                            ))
+                            FROM (
+                                SELECT ar.decision, ar.comments, ar.review_date, r.name AS reviewer_name
+                                FROM article_reviewers ar
+                                JOIN reviewers r ON ar.reviewer_email = r.email
+                                WHERE ar.article_id = a.id AND ar.status = 'Tamamlandı'
+                                ORDER BY ar.review_date DESC
+                            ) rv
+                        ) AS reviews_json,
+                        json_object(
+                            'assigned', COALESCE(t.assigned, 0),
+                            'completed', COALESCE(t.completed, 0),
+                            'accepted', COALESCE(t.accepted, 0),
+                            'rejected', COALESCE(t.rejected, 0),
+                            'revised', COALESCE(t.revised, 0)
+                        ) AS review_summary_json
+                    FROM articles a
+                    LEFT JOIN review_tallies t ON t.article_id = a.id
+                    WHERE a.id = ?
                 ''', (article_id,))
-                
-                article_data = cursor.fetchone()
-                if not article_data:
+
+                row = cursor.fetchone()
+                if not row:
                     return None
-                    
-                article = dict(article_data)
-                
-             
-                cursor.execute('''
-                    SELECT r.name, r.email, ar.status as review_status
-                    FROM article_reviewers ar
-                    JOIN reviewers r ON ar.reviewer_email = r.email
-                    WHERE ar.article_id = ?
-                ''', (article_id,))
-                
-                reviewers = [dict(row) for row in cursor.fetchall()]
-                article['reviewers'] = reviewers
-                
-                # Get reviews
-                cursor.execute('''
-                    SELECT ar.decision, ar.comments, ar.review_date, r.name as reviewer_name
-                    FROM article_reviewers ar
-                    JOIN reviewers r ON ar.reviewer_email = r.email
-                    WHERE ar.article_id = ? AND ar.status = 'Tamamlandı'
-                ''', (article_id,))
-                
-                reviews = [dict(row) for row in cursor.fetchall()]
-                article['reviews'] = reviews
-                
-                # Convert dates to ISO format
-                if article.get('upload_date'):
-                    try:
-                        date_obj = datetime.strptime(article['upload_date'], '%Y-%m-%d %H:%M:%S')
-                        article['submission_date'] = date_obj.isoformat()
-                    except Exception as e:
-                        print(f"[ERROR] Date conversion error: {str(e)}")
-                
+
+                article = dict(row)
+                article['reviewers'] = json.loads(article.pop('reviewers_json'))
+                article['reviews'] = json.loads(article.pop('reviews_json'))
+                article['review_summary'] = json.loads(article.pop('review_summary_json'))
+
+                # Tarih zaten ISO biçiminde saklanıyor
+                article['submission_date'] = article.get('upload_date')
+
                 return article
-                
+
         except Exception as e:
             print(f"[ERROR] get_article_by_id error: {str(e)}")
             return None
 
-    def get_all_articles(self):
-        """Tüm makaleleri listeler"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM articles ORDER BY upload_date DESC')
-            articles = [dict(row) for row in cursor.fetchall()]
-            
-            # Convert dates to ISO format for better JavaScript compatibility
-            for article in articles:
-                try:
-                    if article.get('upload_date'):
-                        # Ensure date is properly formatted
-                        date_obj = datetime.strptime(article['upload_date'], '%Y-%m-%d %H:%M:%S')
-                        article['submission_date'] = date_obj.isoformat()
-                except Exception as e:
-                    print(f"[ERROR] Date conversion error: {str(e)}")
-                    # Set current date as fallback
-                    article['submission_date'] = datetime.now().isoformat()
-            
-            return articles
+    def _article_filters(self, status=None, institution=None, date_from=None, date_to=None, query=None):
+        """Makale listeleri için ortak WHERE koşullarını ve parametrelerini üretir"""
+        clauses, params = [], []
+        if status:
+            statuses = [status] if isinstance(status, str) else list(status)
+            clauses.append(f"a.status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if institution:
+            clauses.append('a.institution = ?')
+            params.append(institution)
+        if date_from:
+            clauses.append('a.upload_date >= ?')
+            params.append(date_from)
+        if date_to:
+            # Sadece tarih verildiyse o günün tamamı dahil edilir
+            clauses.append("a.upload_date < date(?, '+1 day')")
+            params.append(date_to)
+        if query:
+            clauses.append('a.title LIKE ?')
+            params.append(f"%{query}%")
+        return clauses, params
+
+    def _fetch_article_page(self, select_sql, clauses, params, limit=None, cursor=None,
+                            sort='date_desc', include_total=False):
+        """
+        (upload_date, id) üzerinden imleç (keyset) sayfalama yapar.
+
+        Sonraki sayfa OFFSET ile değil son satırın (upload_date, id) değerinden
+        devam eder; böylece her sayfa indeksten okunur. limit None ise tüm
+        satırlar döner.
+        """
+        descending = sort != 'date_asc'
+        where = list(clauses)
+        where_params = list(params)
+        page_clauses, page_params = list(clauses), list(params)
+        if cursor:
+            page_clauses.append(f"(a.upload_date, a.id) {'<' if descending else '>'} (?, ?)")
+            page_params.extend(decode_cursor(cursor))
+
+        direction = 'DESC' if descending else 'ASC'
+        sql = select_sql
+        if page_clauses:
+            sql += ' WHERE ' + ' AND '.join(page_clauses)
+        sql += f' ORDER BY a.upload_date {direction}, a.id {direction}'
+        if limit is not None:
+            # Bir fazla satır okunarak sonraki sayfanın varlığı anlaşılır
+            sql += ' LIMIT ?'
+            page_params.append(limit + 1)
+
+        with self.connect() as conn:
+            db_cursor = conn.cursor()
+            db_cursor.execute(sql, page_params)
+            articles = [dict(row) for row in db_cursor.fetchall()]
+
+            next_cursor = None
+            if limit is not None and len(articles) > limit:
+                articles = articles[:limit]
+                last = articles[-1]
+                next_cursor = encode_cursor(last['upload_date'], last['id'])
+
+            page = {'articles': articles, 'next_cursor': next_cursor}
+            if include_total:
+                count_sql = 'SELECT COUNT(*) FROM (' + select_sql
+                if where:
+                    count_sql += ' WHERE ' + ' AND '.join(where)
+                db_cursor.execute(count_sql + ')', where_params)
+                page['total'] = db_cursor.fetchone()[0]
+            return page
+
+    def get_all_articles(self, limit=None, cursor=None, sort='date_desc', include_total=False, **filters):
+        """
+        Makaleleri sayfa sayfa listeler.
+        filters: status, institution, date_from, date_to, query (başlıkta arama)
+        Dönüş: {'articles': [...], 'next_cursor': str|None[, 'total': int]}
+        """
+        clauses, params = self._article_filters(**filters)
+        return self._fetch_article_page(f'''
+            SELECT {ARTICLE_LIST_COLUMNS}, a.upload_date AS submission_date,
+                   COALESCE(t.assigned, 0) AS reviewers_assigned,
+                   COALESCE(t.completed, 0) AS reviews_completed
+            FROM articles a
+            LEFT JOIN review_tallies t ON t.article_id = a.id
+        ''', clauses, params, limit, cursor, sort, include_total)
 
     def add_user(self, name, email, password, role):
         """Yeni kullanıcı ekler"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT INTO users (name, email, password, role, created_at)
                     VALUES (?, ?, ?, ?, ?)
                 ''', (
                     name, email, password, role,
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    timestamp()
                 ))
                 conn.commit()
                 return cursor.lastrowid
@@ -294,8 +447,7 @@ class Database:
 
     def get_user_by_email(self, email):
         """Email ile kullanıcı bilgilerini getirir"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM users WHERE email = ?', (email,))
             user = cursor.fetchone()
@@ -303,31 +455,59 @@ class Database:
 
     def get_reviewer_by_email(self, email):
         """Email ile hakem bilgilerini getirir"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM reviewers WHERE email = ?', (email,))
             reviewer = cursor.fetchone()
             return dict(reviewer) if reviewer else None
 
-    def get_articles_by_reviewer(self, email):
-        """Hakeme atanmış makaleleri getirir"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+    def get_articles_by_reviewer(self, email, limit=None, cursor=None, sort='date_desc',
+                                 include_total=False, **filters):
+        """Hakeme atanmış makaleleri sayfa sayfa getirir (bkz. get_all_articles)"""
+        clauses, params = self._article_filters(**filters)
+        # Dosya yolu ve kurum bilgisi hakeme gönderilmez
+        return self._fetch_article_page('''
+            SELECT a.id, a.title, a.keywords, a.tracking_code, a.upload_date, a.status,
+                   ar.status as review_status
+            FROM articles a
+            JOIN article_reviewers ar ON a.id = ar.article_id AND ar.reviewer_email = ?
+        ''', clauses, [email] + params, limit, cursor, sort, include_total)
+
+    def get_reviewer_dashboard_state(self, email, due_before):
+        """
+        Hakem paneli sayaçlarını tek sorguda döndürür: pending, completed,
+        overdue (due_before'dan önce atanıp hâlâ bekleyen) ve version.
+        """
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('''
-                SELECT a.*, ar.status as review_status
-                FROM articles a
-                JOIN article_reviewers ar ON a.id = ar.article_id
-                WHERE ar.reviewer_email = ?
-                ORDER BY a.upload_date DESC
-            ''', (email,))
-            return [dict(row) for row in cursor.fetchall()]
+                SELECT COALESCE(s.pending, 0) AS pending,
+                       COALESCE(s.completed, 0) AS completed,
+                       COALESCE(s.version, 0) AS version,
+                       (
+                           SELECT COUNT(*) FROM article_reviewers ar
+                           WHERE ar.reviewer_email = :email
+                             AND ar.status IS NOT 'Tamamlandı'
+                             AND ar.assigned_date < :due_before
+                       ) AS overdue
+                FROM (SELECT 1)
+                LEFT JOIN reviewer_summaries s ON s.reviewer_email = :email
+            ''', {'email': email, 'due_before': due_before})
+            return dict(cursor.fetchone())
+
+    def get_reviewer_pending_articles(self, email, limit=None, cursor=None):
+        """Hakemin değerlendirmesini bekleyen makaleleri sayfa sayfa getirir"""
+        return self._fetch_article_page('''
+            SELECT a.id, a.title, a.keywords, a.tracking_code, a.upload_date,
+                   ar.status AS review_status, ar.assigned_date
+            FROM articles a
+            JOIN article_reviewers ar ON a.id = ar.article_id AND ar.reviewer_email = ?
+        ''', ["ar.status IS NOT 'Tamamlandı'"], [email], limit, cursor)
 
     def add_review(self, article_id, reviewer_email, decision, comments):
         """Makale değerlendirmesini ekler"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect() as conn:
                 cursor = conn.cursor()
                 
                 # Önce bu hakemin bu makale için yetkisi var mı kontrol et
@@ -342,28 +522,18 @@ class Database:
                     return False
                     
                 # Değerlendirmeyi güncelle
-                current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                current_time = timestamp()
                 cursor.execute('''
                     UPDATE article_reviewers 
                     SET status = ?, decision = ?, comments = ?, review_date = ?
                     WHERE article_id = ? AND reviewer_email = ?
                 ''', ('Tamamlandı', decision, comments, current_time, article_id, reviewer_email))
                 
-                # Tüm hakemlerin değerlendirmelerini kontrol et
-                cursor.execute('''
-                    SELECT COUNT(*) as total, 
-                           SUM(CASE WHEN status = 'Tamamlandı' THEN 1 ELSE 0 END) as completed,
-                           SUM(CASE WHEN decision = 'accept' THEN 1 
-                                   WHEN decision = 'reject' THEN -1 
-                                   ELSE 0 END) as decision_sum
-                    FROM article_reviewers 
-                    WHERE article_id = ?
-                ''', (article_id,))
-                
-                stats = cursor.fetchone()
-                if stats[1] == stats[0]:  # Tüm hakemler değerlendirme yaptıysa
+                # Sayaçlar tetikleyicilerle aynı işlemde güncellendi (bkz. migrations._review_tallies)
+                tally = self._review_tally(cursor, article_id)
+                if tally['completed'] == tally['assigned']:  # Tüm hakemler değerlendirme yaptıysa
                     # Çoğunluk kararına göre makale durumunu güncelle
-                    new_status = 'Kabul Edildi' if stats[2] > 0 else 'Reddedildi'
+                    new_status = 'Kabul Edildi' if tally['accepted'] > tally['rejected'] else 'Reddedildi'
                     cursor.execute('''
                         UPDATE articles 
                         SET status = ? 
@@ -371,18 +541,33 @@ class Database:
                     ''', (new_status, article_id))
                 
                 conn.commit()
-                print(f"[INFO] Değerlendirme başarıyla eklendi: article_id={article_id}, reviewer={reviewer_email}")
-                return True
+            self.article_cache.invalidate(int(article_id))
+            print(f"[INFO] Değerlendirme başarıyla eklendi: article_id={article_id}, reviewer={reviewer_email}")
+            return True
                 
         except Exception as e:
             print(f"[HATA] Değerlendirme eklenirken hata: {str(e)}")
             return False
 
+    def _review_tally(self, cursor, article_id):
+        cursor.execute('''
+            SELECT assigned, completed, accepted, rejected, revised
+            FROM review_tallies WHERE article_id = ?
+        ''', (article_id,))
+        row = cursor.fetchone()
+        if not row:
+            return dict.fromkeys(('assigned', 'completed', 'accepted', 'rejected', 'revised'), 0)
+        return dict(row)
+
+    def get_review_tally(self, article_id):
+        """Makalenin atanan/tamamlanan değerlendirme ve karar sayılarını döndürür"""
+        with self.connect() as conn:
+            return self._review_tally(conn.cursor(), article_id)
+
     def get_article_reviews(self, tracking_code):
         """Makaleye ait değerlendirmeleri getirir"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
+            with self.connect() as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -402,10 +587,63 @@ class Database:
             print(f"[HATA] Değerlendirmeler alınırken hata: {str(e)}")
             return []
 
+    def _insert_assignments(self, cursor, pairs):
+        """
+        (article_id, reviewer_email) çiftlerini tek executemany ile atar.
+        Zaten atanmış ya da makalesi/hakemi olmayan çiftler atlanır.
+        (oluşturulan, atlanan) sayılarını döndürür; commit çağırana aittir.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return 0, 0
+        now = timestamp()
+        cursor.executemany('''
+            INSERT OR IGNORE INTO article_reviewers (article_id, reviewer_email, assigned_date, status)
+            SELECT :article_id, :reviewer_email, :now, 'Beklemede'
+            WHERE EXISTS (SELECT 1 FROM articles WHERE id = :article_id)
+              AND EXISTS (SELECT 1 FROM reviewers WHERE email = :reviewer_email)
+        ''', [
+            {'article_id': article_id, 'reviewer_email': reviewer_email, 'now': now}
+            for article_id, reviewer_email in pairs
+        ])
+        # rowcount tetikleyicilerin (review_tallies) değişikliklerini saymaz
+        created = max(cursor.rowcount, 0)
+        return created, len(pairs) - created
+
+    def bulk_assign(self, pairs=None, reviewer_emails=None, article_status=None, unassigned_only=False):
+        """
+        Toplu hakem ataması yapar ve {'created': n, 'skipped': m} döndürür.
+
+        pairs verilirse bu (article_id, reviewer_email) çiftleri atanır; aksi halde
+        kurala uyan makaleler (article_status, unassigned_only) reviewer_emails
+        listesindeki her hakeme atanır. Tamamı tek işlemde yapılır.
+        """
+        with self.connect() as conn:
+            cursor = conn.cursor()
+            if pairs is None:
+                # İşlenen makaleler worker bitirince atanır (bkz. finish_processing)
+                clauses, params = ['a.status != ?'], [STATUS_PROCESSING]
+                if article_status:
+                    clauses.append('a.status = ?')
+                    params.append(article_status)
+                if unassigned_only:
+                    clauses.append('NOT EXISTS (SELECT 1 FROM article_reviewers ar WHERE ar.article_id = a.id)')
+                sql = 'SELECT a.id FROM articles a WHERE ' + ' AND '.join(clauses)
+                cursor.execute(sql, params)
+                article_ids = [row[0] for row in cursor.fetchall()]
+                pairs = [(article_id, email) for article_id in article_ids for email in reviewer_emails or []]
+
+            created, skipped = self._insert_assignments(cursor, pairs)
+            conn.commit()
+            for article_id in {article_id for article_id, _ in pairs}:
+                self.article_cache.invalidate(int(article_id))
+            print(f"[INFO] Toplu hakem ataması: {created} oluşturuldu, {skipped} atlandı")
+            return {'created': created, 'skipped': skipped}
+
     def assign_article_to_reviewer(self, article_id, reviewer_email):
         """Makaleyi hakeme atar"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect() as conn:
                 cursor = conn.cursor()
                 cursor.execute('''
                     INSERT INTO article_reviewers (article_id, reviewer_email, assigned_date, status)
@@ -413,41 +651,37 @@ class Database:
                 ''', (
                     article_id, 
                     reviewer_email, 
-                    datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                    timestamp(),
                     'Beklemede'
                 ))
                 conn.commit()
-                return True
+            self.article_cache.invalidate(int(article_id))
+            return True
         except sqlite3.IntegrityError:
             return False
 
-    def get_unassigned_articles(self):
-        """Henüz hakeme atanmamış makaleleri getirir"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT a.* FROM articles a
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM article_reviewers ar
-                    WHERE ar.article_id = a.id
-                )
-                ORDER BY a.upload_date DESC
-            ''')
-            return [dict(row) for row in cursor.fetchall()]
+    def get_unassigned_articles(self, limit=None, cursor=None, sort='date_desc',
+                                include_total=False, **filters):
+        """Henüz hakeme atanmamış makaleleri sayfa sayfa getirir (bkz. get_all_articles)"""
+        clauses, params = self._article_filters(**filters)
+        clauses.insert(0, '''NOT EXISTS (
+                SELECT 1 FROM article_reviewers ar
+                WHERE ar.article_id = a.id
+            )''')
+        return self._fetch_article_page(f'SELECT {ARTICLE_LIST_COLUMNS} FROM articles a', clauses, params,
+                                        limit, cursor, sort, include_total)
 
     def get_all_reviewers(self):
         """Tüm hakemleri listeler"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.connect() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM reviewers ORDER BY name')
             return [dict(row) for row in cursor.fetchall()]
 
-    def add_test_reviewer(self):
-        """Test hakemlerini ekler ve makaleleri atar"""
+    def add_test_reviewer(self, reset=False):
+        """Test hakemlerini ekler ve makaleleri atar (reset=True ise önce tüm atamaları siler)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self.connect() as conn:
                 cursor = conn.cursor()
                 # Test hakemleri ekle
                 test_reviewers = [
@@ -456,36 +690,26 @@ class Database:
                     ('Hakem-3', 'hakem3@example.com')
                 ]
                 
-                for name, email in test_reviewers:
-                    cursor.execute('''
-                        INSERT OR IGNORE INTO reviewers (name, email, created_at)
-                        VALUES (?, ?, ?)
-                    ''', (
-                        name,
-                        email,
-                        datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    ))
-                
-                # Tüm makaleleri al
-                cursor.execute('SELECT id FROM articles')
-                all_articles = cursor.fetchall()
+                now = timestamp()
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO reviewers (name, email, created_at)
+                    VALUES (?, ?, ?)
+                ''', [(name, email, now) for name, email in test_reviewers])
+
+                if reset:
+                    # Silme ve yeniden atama aynı işlemde; yarım kalırsa eski atamalar korunur
+                    cursor.execute('DELETE FROM article_reviewers')
                 
-                # Her makaleyi her hakeme ata
-                for article in all_articles:
-                    for reviewer in test_reviewers:
-                        cursor.execute('''
-                            INSERT OR IGNORE INTO article_reviewers 
-                            (article_id, reviewer_email, assigned_date, status)
-                            VALUES (?, ?, ?, ?)
-                        ''', (
-                            article[0],
-                            reviewer[1],  # reviewer email
-                            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                            'Beklemede'
-                        ))
+                # Her makaleyi her hakeme ata (işlenenler worker bitirince atanır)
+                cursor.execute('SELECT id FROM articles WHERE status != ?', (STATUS_PROCESSING,))
+                article_ids = [row[0] for row in cursor.fetchall()]
+                self._insert_assignments(cursor, [
+                    (article_id, email) for article_id in article_ids for _, email in test_reviewers
+                ])
                 
                 conn.commit()
-                return True
+            self.article_cache.clear()
+            return True
         except Exception as e:
             print(f"Test hakemler eklenirken hata: {str(e)}")
-            return False
\ No newline at end of file
+            return False
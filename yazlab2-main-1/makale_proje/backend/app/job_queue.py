@@ -0,0 +1,236 @@
+import os
+import json
+from datetime import datetime, timedelta
+from database import get_connection, timestamp
+from migrations import ensure_schema
+
+class JobQueue:
+    """SQLite üzerinde kalıcı arka plan iş kuyruğu.
+
+    İşler makale.db içindeki `jobs` tablosunda tutulur; bu sayede sunucu veya
+    worker yeniden başlatıldığında kuyruk kaybolmaz. Birden fazla worker süreci
+    aynı kuyruğu güvenle paylaşabilir.
+    """
+
+    # İş durumları
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, db_path=None, lease_seconds=600):
+        self.db_path = db_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'makale.db')
+        # Çöken bir worker'ın aldığı iş bu süre sonunda tekrar kuyruğa düşer
+        self.lease_seconds = lease_seconds
+        self.init_db()
+
+    def init_db(self):
+        ensure_schema(self.db_path)
+
+    def _now(self):
+        return timestamp()
+
+    def enqueue(self, kind, payload, tracking_code=None, max_attempts=3, cursor=None):
+        """Kuyruğa yeni iş ekler ve iş ID'sini döndürür.
+
+        cursor verilirse iş çağıranın işleminde eklenir ve commit çağırana kalır
+        (ör. makale kaydıyla birlikte; bkz. Database.add_article).
+        """
+        if cursor is not None:
+            return self._insert(cursor, kind, payload, tracking_code, max_attempts)
+        with get_connection(self.db_path) as conn:
+            job_id = self._insert(conn.cursor(), kind, payload, tracking_code, max_attempts)
+            conn.commit()
+            return job_id
+
+    def _insert(self, cursor, kind, payload, tracking_code, max_attempts):
+        cursor.execute('''
+            INSERT INTO jobs (kind, tracking_code, payload, status, max_attempts, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (kind, tracking_code, json.dumps(payload), self.QUEUED, max_attempts, self._now()))
+        print(f"[INFO] Kuyruğa iş eklendi: id={cursor.lastrowid}, kind={kind}, tracking_code={tracking_code}")
+        return cursor.lastrowid
+
+    def claim(self, worker_name, on_expired=None):
+        """Sıradaki işi atomik olarak alır, iş yoksa None döndürür.
+
+        Süresi dolmuş `running` işler (çöken worker) deneme hakkı kaldıysa
+        yeniden alınır; kalmadıysa aynı işlemde başarısız işaretlenir ve her
+        biri için on_expired(cursor, job) çağrılır (ör. makale durumu).
+        """
+        now = datetime.now()
+        lease_until = timestamp(now + timedelta(seconds=self.lease_seconds))
+        now = timestamp(now)
+
+        conn = get_connection(self.db_path)
+        if conn.in_transaction:
+            conn.commit()
+        try:
+            cursor = conn.cursor()
+            # Yazma kilidini baştan al ki iki worker aynı işi seçemesin
+            cursor.execute('BEGIN IMMEDIATE')
+            cursor.execute('''
+                SELECT * FROM jobs
+                WHERE status = ? AND lease_until < ? AND attempts >= max_attempts
+            ''', (self.RUNNING, now))
+            for expired in [dict(row) for row in cursor.fetchall()]:
+                cursor.execute('''
+                    UPDATE jobs
+                    SET status = ?, error = ?, lease_until = NULL, finished_at = ?
+                    WHERE id = ?
+                ''', (self.FAILED, 'Süre aşımı: deneme hakkı kalmadı', now, expired['id']))
+                print(f"[HATA] İşin süresi doldu, deneme hakkı kalmadı: id={expired['id']}")
+                if on_expired:
+                    expired['payload'] = json.loads(expired['payload'])
+                    on_expired(cursor, expired)
+
+            cursor.execute('''
+                SELECT * FROM jobs
+                WHERE status = ? OR (status = ? AND lease_until < ? AND attempts < max_attempts)
+                ORDER BY id
+                LIMIT 1
+            ''', (self.QUEUED, self.RUNNING, now))
+            job = cursor.fetchone()
+            if not job:
+                conn.commit()
+                return None
+
+            cursor.execute('''
+                UPDATE jobs
+                SET status = ?, worker = ?, lease_until = ?, started_at = ?, attempts = attempts + 1
+                WHERE id = ?
+            ''', (self.RUNNING, worker_name, lease_until, now, job['id']))
+            conn.commit()
+
+            job = dict(job)
+            job['payload'] = json.loads(job['payload'])
+            job['attempts'] += 1
+            return job
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+    def complete(self, job_id, before_commit=None):
+        """İşi başarıyla tamamlandı olarak işaretler.
+
+        before_commit(cursor) verilirse aynı işlemde çalışır; hata fırlatırsa
+        iş tamamlanmış sayılmaz (ör. makale durumu yazılamadıysa tekrar denenir).
+        """
+        conn = get_connection(self.db_path)
+        if conn.in_transaction:
+            conn.commit()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            if before_commit:
+                before_commit(cursor)
+            cursor.execute('''
+                UPDATE jobs
+                SET status = ?, error = NULL, lease_until = NULL, finished_at = ?
+                WHERE id = ?
+            ''', (self.DONE, self._now(), job_id))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def fail(self, job_id, error):
+        """İşi hatalı olarak işaretler; deneme hakkı kaldıysa tekrar kuyruğa alır.
+
+        İş kalıcı olarak başarısız olduysa True döndürür.
+        """
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT attempts, max_attempts FROM jobs WHERE id = ?', (job_id,))
+            row = cursor.fetchone()
+            if not row:
+                return False
+
+            final = row[0] >= row[1]
+            cursor.execute('''
+                UPDATE jobs
+                SET status = ?, error = ?, lease_until = NULL, finished_at = ?
+                WHERE id = ?
+            ''', (
+                self.FAILED if final else self.QUEUED,
+                str(error),
+                self._now() if final else None,
+                job_id
+            ))
+            conn.commit()
+            return final
+
+    def renew_lease(self, job_id, worker_name):
+        """Çalışan işin kira süresini uzatır; iş artık bu worker'da değilse False döndürür"""
+        lease_until = timestamp(datetime.now() + timedelta(seconds=self.lease_seconds))
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE jobs SET lease_until = ?
+                WHERE id = ? AND status = ? AND worker = ?
+            ''', (lease_until, job_id, self.RUNNING, worker_name))
+            conn.commit()
+            return cursor.rowcount == 1
+
+    def register_worker(self, worker_name):
+        """Worker sürecini kaydeder (henüz hazır değil)"""
+        now = self._now()
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO workers (name, started_at, ready_at, ner_load_seconds, last_seen)
+                VALUES (?, ?, NULL, NULL, ?)
+            ''', (worker_name, now, now))
+            conn.commit()
+
+    def mark_worker_ready(self, worker_name, ner_load_seconds):
+        """Worker'ın NER modelini yüklediğini kaydeder"""
+        now = self._now()
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                UPDATE workers SET ready_at = ?, ner_load_seconds = ?, last_seen = ?
+                WHERE name = ?
+            ''', (now, ner_load_seconds, now, worker_name))
+            conn.commit()
+
+    def heartbeat(self, worker_name):
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('UPDATE workers SET last_seen = ? WHERE name = ?', (self._now(), worker_name))
+            conn.commit()
+
+    def get_workers(self, active_seconds=600):
+        """Son active_seconds içinde sinyal veren worker'ları listeler"""
+        since = timestamp(datetime.now() - timedelta(seconds=active_seconds))
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM workers WHERE last_seen >= ? ORDER BY name', (since,))
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_job(self, job_id):
+        """ID ile iş bilgilerini getirir"""
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM jobs WHERE id = ?', (job_id,))
+            job = cursor.fetchone()
+            return self._public(job) if job else None
+
+    def get_job_by_tracking_code(self, tracking_code):
+        """Takip koduna ait en son işi getirir"""
+        with get_connection(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT * FROM jobs WHERE tracking_code = ? ORDER BY id DESC LIMIT 1
+            ''', (tracking_code,))
+            job = cursor.fetchone()
+            return self._public(job) if job else None
+
+    def _public(self, job):
+        # Dosya yolları gibi iç bilgileri (payload) dışarı vermiyoruz
+        job = dict(job)
+        job.pop('payload', None)
+        job.pop('worker', None)
+        job.pop('lease_until', None)
+        return job
@@ -0,0 +1,440 @@
+"""Sürümlü veritabanı şeması.
+
+Şema değişiklikleri MIGRATIONS listesinde sırayla tanımlanır ve her biri
+veritabanına yalnızca bir kez uygulanır; uygulanan sürümler
+`schema_migrations` tablosunda tutulur. Yeni bir değişiklik için listenin
+sonuna yeni sürüm eklenir, uygulanmış migration'lar değiştirilmez.
+"""
+import ntpath
+import os
+import threading
+from database import get_connection, timestamp
+from storage import ContentStore
+
+def _base_tables(cursor):
+    # Makaleler tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            keywords TEXT,
+            institution TEXT,
+            tracking_code TEXT UNIQUE NOT NULL,
+            file_path TEXT NOT NULL,
+            anonymized_filename TEXT,
+            original_filename TEXT,
+            upload_date TIMESTAMP,
+            status TEXT DEFAULT 'Beklemede'
+        )
+    ''')
+
+    # Eski veritabanlarında original_filename sütunu yok (eski scripts/db_fix.py)
+    cursor.execute("PRAGMA table_info(articles)")
+    columns = [column[1] for column in cursor.fetchall()]
+    if 'original_filename' not in columns:
+        cursor.execute("ALTER TABLE articles ADD COLUMN original_filename TEXT")
+
+    # Hakemler tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reviewers (
+            name TEXT NOT NULL,
+            email TEXT PRIMARY KEY,
+            created_at TIMESTAMP
+        )
+    ''')
+
+    # Makale-Hakem ilişki tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS article_reviewers (
+            article_id INTEGER,
+            reviewer_email TEXT,
+            assigned_date TIMESTAMP,
+            status TEXT DEFAULT 'Beklemede',
+            decision TEXT,
+            comments TEXT,
+            review_date TIMESTAMP,
+            PRIMARY KEY (article_id, reviewer_email),
+            FOREIGN KEY (article_id) REFERENCES articles (id),
+            FOREIGN KEY (reviewer_email) REFERENCES reviewers (email)
+        )
+    ''')
+
+    # Değerlendirmeler tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reviews (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id INTEGER,
+            reviewer_email TEXT,
+            decision TEXT,
+            comments TEXT,
+            review_date TIMESTAMP,
+            FOREIGN KEY (article_id) REFERENCES articles (id),
+            FOREIGN KEY (reviewer_email) REFERENCES reviewers (email)
+        )
+    ''')
+
+    # Kullanıcılar tablosu
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL,
+            created_at TIMESTAMP
+        )
+    ''')
+
+def _job_queue_tables(cursor):
+    # Arka plan iş kuyruğu (job_queue.JobQueue)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            tracking_code TEXT,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            max_attempts INTEGER NOT NULL DEFAULT 3,
+            error TEXT,
+            worker TEXT,
+            lease_until TIMESTAMP,
+            created_at TIMESTAMP,
+            started_at TIMESTAMP,
+            finished_at TIMESTAMP
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_jobs_tracking_code ON jobs (tracking_code)')
+
+    # Worker süreçlerinin hazır olma durumu (NER modeli yüklendi mi)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS workers (
+            name TEXT PRIMARY KEY,
+            started_at TIMESTAMP,
+            ready_at TIMESTAMP,
+            ner_load_seconds REAL,
+            last_seen TIMESTAMP
+        )
+    ''')
+
+def _anonymization_cache_tables(cursor):
+    # Anonimleştirme sonuç önbelleği (anonymization_cache.AnonymizationCache)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS anonymization_cache (
+            content_hash TEXT NOT NULL,
+            config_version TEXT NOT NULL,
+            file_path TEXT NOT NULL,
+            size_bytes INTEGER NOT NULL,
+            created_at TIMESTAMP,
+            last_used_at TIMESTAMP,
+            PRIMARY KEY (content_hash, config_version)
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_anonymization_cache_last_used
+        ON anonymization_cache (last_used_at)
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS cache_stats (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+
+def _review_indexes(cursor):
+    # get_articles_by_reviewer: hakemin atamaları
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_article_reviewers_reviewer
+        ON article_reviewers (reviewer_email, article_id)
+    ''')
+    # get_article_reviews / get_article_by_id: makalenin tamamlanan değerlendirmeleri
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_article_reviewers_article_status
+        ON article_reviewers (article_id, status)
+    ''')
+    # get_all_articles / get_unassigned_articles: tarihe göre sıralama
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_upload_date ON articles (upload_date)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_status ON articles (status)')
+    cursor.execute('ANALYZE')
+
+def _tracking_counters(cursor):
+    # Günlük takip kodu sayacı (Database.generate_tracking_code)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tracking_counters (
+            day TEXT PRIMARY KEY,
+            last_number INTEGER NOT NULL
+        )
+    ''')
+    # Mevcut kodların devamından numara verilsin (MKL-YYYYMMDD-XXXX)
+    cursor.execute('''
+        INSERT OR REPLACE INTO tracking_counters (day, last_number)
+        SELECT substr(tracking_code, 5, 8), MAX(CAST(substr(tracking_code, 14) AS INTEGER))
+        FROM articles
+        WHERE tracking_code LIKE 'MKL-________-%'
+        GROUP BY substr(tracking_code, 5, 8)
+    ''')
+
+# Metin zaman damgası tutan sütunlar (tablo, sütunlar)
+TIMESTAMP_COLUMNS = [
+    ('articles', ['upload_date']),
+    ('reviewers', ['created_at']),
+    ('article_reviewers', ['assigned_date', 'review_date']),
+    ('reviews', ['review_date']),
+    ('users', ['created_at']),
+    ('jobs', ['lease_until', 'created_at', 'started_at', 'finished_at']),
+    ('workers', ['started_at', 'ready_at', 'last_seen']),
+    ('anonymization_cache', ['created_at', 'last_used_at']),
+    ('schema_migrations', ['applied_at']),
+]
+
+def _iso_timestamps(cursor):
+    # 'YYYY-MM-DD HH:MM:SS' -> 'YYYY-MM-DDTHH:MM:SS' (database.TIMESTAMP_FORMAT);
+    # biçime uymayan değerlere dokunulmaz
+    for table, columns in TIMESTAMP_COLUMNS:
+        for column in columns:
+            cursor.execute(f'''
+                UPDATE {table} SET {column} = replace({column}, ' ', 'T')
+                WHERE {column} GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]'
+            ''')
+
+# article_reviewers satırının review_tallies'e katkısı (NEW/OLD ile kullanılır)
+_TALLY_TERMS = {
+    'assigned': '1',
+    'completed': "({row}.status IS 'Tamamlandı')",
+    'accepted': "({row}.decision IS 'accept')",
+    'rejected': "({row}.decision IS 'reject')",
+    'revised': "({row}.decision IS NOT NULL AND {row}.decision NOT IN ('accept', 'reject'))",
+}
+
+def _tally_add(row):
+    columns = ', '.join(_TALLY_TERMS)
+    values = ', '.join(term.format(row=row) for term in _TALLY_TERMS.values())
+    updates = ', '.join(f"{name} = {name} + excluded.{name}" for name in _TALLY_TERMS)
+    return f'''
+        INSERT INTO review_tallies (article_id, {columns})
+        VALUES ({row}.article_id, {values})
+        ON CONFLICT(article_id) DO UPDATE SET {updates};
+    '''
+
+def _tally_subtract(row):
+    updates = ', '.join(f"{name} = {name} - {term.format(row=row)}" for name, term in _TALLY_TERMS.items())
+    return f"UPDATE review_tallies SET {updates} WHERE article_id = {row}.article_id;"
+
+def _review_tallies(cursor):
+    # Makale başına hakem/değerlendirme sayaçları. article_reviewers'a yazan her
+    # ifade tetikleyiciler sayesinde sayaçları aynı işlem içinde günceller.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS review_tallies (
+            article_id INTEGER PRIMARY KEY,
+            assigned INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            accepted INTEGER NOT NULL DEFAULT 0,
+            rejected INTEGER NOT NULL DEFAULT 0,
+            revised INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (article_id) REFERENCES articles (id)
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_review_tallies_insert
+        AFTER INSERT ON article_reviewers
+        BEGIN {_tally_add('NEW')} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_review_tallies_delete
+        AFTER DELETE ON article_reviewers
+        BEGIN {_tally_subtract('OLD')} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_review_tallies_update
+        AFTER UPDATE OF article_id, status, decision ON article_reviewers
+        BEGIN {_tally_subtract('OLD')} {_tally_add('NEW')} END
+    ''')
+
+    # Mevcut atamalardan başlangıç değerleri
+    sums = ', '.join(f"SUM({term.format(row='ar')})" for term in _TALLY_TERMS.values())
+    cursor.execute(f'''
+        INSERT OR REPLACE INTO review_tallies (article_id, {', '.join(_TALLY_TERMS)})
+        SELECT ar.article_id, {sums}
+        FROM article_reviewers ar
+        GROUP BY ar.article_id
+    ''')
+
+def _reviewer_summary_add(row):
+    return f'''
+        INSERT INTO reviewer_summaries (reviewer_email, pending, completed, version)
+        VALUES ({row}.reviewer_email, ({row}.status IS NOT 'Tamamlandı'), ({row}.status IS 'Tamamlandı'), 1)
+        ON CONFLICT(reviewer_email) DO UPDATE SET
+            pending = pending + excluded.pending,
+            completed = completed + excluded.completed,
+            version = version + 1;
+    '''
+
+def _reviewer_summary_subtract(row):
+    return f'''
+        UPDATE reviewer_summaries SET
+            pending = pending - ({row}.status IS NOT 'Tamamlandı'),
+            completed = completed - ({row}.status IS 'Tamamlandı'),
+            version = version + 1
+        WHERE reviewer_email = {row}.reviewer_email;
+    '''
+
+def _reviewer_summaries(cursor):
+    # Hakem paneli için bekleyen/tamamlanan sayıları ve değişiklik sürümü.
+    # version hakemin atamalarındaki her değişiklikte artar (ETag için).
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS reviewer_summaries (
+            reviewer_email TEXT PRIMARY KEY,
+            pending INTEGER NOT NULL DEFAULT 0,
+            completed INTEGER NOT NULL DEFAULT 0,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_reviewer_summaries_insert
+        AFTER INSERT ON article_reviewers
+        BEGIN {_reviewer_summary_add('NEW')} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_reviewer_summaries_delete
+        AFTER DELETE ON article_reviewers
+        BEGIN {_reviewer_summary_subtract('OLD')} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_reviewer_summaries_update
+        AFTER UPDATE ON article_reviewers
+        BEGIN {_reviewer_summary_subtract('OLD')} {_reviewer_summary_add('NEW')} END
+    ''')
+    cursor.execute('''
+        INSERT OR REPLACE INTO reviewer_summaries (reviewer_email, pending, completed, version)
+        SELECT reviewer_email,
+               SUM(status IS NOT 'Tamamlandı'),
+               SUM(status IS 'Tamamlandı'),
+               1
+        FROM article_reviewers
+        GROUP BY reviewer_email
+    ''')
+    # Gecikmiş (süresi geçmiş bekleyen) atamaların sayımı için
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_article_reviewers_reviewer_status
+        ON article_reviewers (reviewer_email, status, assigned_date)
+    ''')
+
+def _content_addressed_storage(cursor):
+    # Düz pdf_storage/ klasöründeki dosyalar depoya kopyalanır ve file_path
+    # mutlak yol yerine depo anahtarı olur. Eski dosyalar silinmez; işlem
+    # geri alınırsa kayıtlar hâlâ onları gösterir.
+    cursor.execute('PRAGMA database_list')
+    db_file = next(row[2] for row in cursor.fetchall() if row[1] == 'main')
+    store = ContentStore(os.path.join(os.path.dirname(db_file), 'pdf_storage'))
+
+    keys = {}
+    def to_key(path):
+        if path not in keys:
+            # Kayıtlar başka makinede (ör. Windows) yazılmış mutlak yollar
+            # olabilir; dosya adı yerel düz klasörde de aranır
+            local = os.path.join(store.root, ntpath.basename(path))
+            source = next((p for p in (path, local) if os.path.isfile(p)), None)
+            keys[path] = store.put_file(source, move=False) if source else None
+        return keys[path]
+
+    cursor.execute("SELECT id, file_path FROM articles WHERE file_path != ''")
+    missing = 0
+    for article_id, path in cursor.fetchall():
+        if ContentStore.is_key(path):
+            continue
+        key = to_key(path)
+        if key:
+            cursor.execute('UPDATE articles SET file_path = ? WHERE id = ?', (key, article_id))
+        else:
+            missing += 1
+
+    cursor.execute('SELECT content_hash, config_version, file_path FROM anonymization_cache')
+    for content_hash, config_version, path in cursor.fetchall():
+        if ContentStore.is_key(path):
+            continue
+        key = to_key(path)
+        if key:
+            cursor.execute('''
+                UPDATE anonymization_cache SET file_path = ?
+                WHERE content_hash = ? AND config_version = ?
+            ''', (key, content_hash, config_version))
+        else:
+            cursor.execute('''
+                DELETE FROM anonymization_cache
+                WHERE content_hash = ? AND config_version = ?
+            ''', (content_hash, config_version))
+
+    copied = sum(1 for key in keys.values() if key)
+    print(f"[INFO] {copied} PDF depoya kopyalandı, dosyası bulunamayan makale: {missing}")
+    if copied:
+        print(f"[INFO] Eski düz dosyalar {store.root} altında bırakıldı; elle silinebilir")
+
+# (sürüm, açıklama, uygulayan fonksiyon) - sadece sona ekleyin
+MIGRATIONS = [
+    (1, 'Temel tablolar', _base_tables),
+    (2, 'İş kuyruğu ve worker tabloları', _job_queue_tables),
+    (3, 'Anonimleştirme önbelleği tabloları', _anonymization_cache_tables),
+    (4, 'Makale ve hakem atama indeksleri', _review_indexes),
+    (5, 'Günlük takip kodu sayacı', _tracking_counters),
+    (6, 'ISO-8601 zaman damgaları', _iso_timestamps),
+    (7, 'Makale başına değerlendirme sayaçları', _review_tallies),
+    (8, 'Hakem paneli özetleri', _reviewer_summaries),
+    (9, 'İçerik adresli PDF deposu', _content_addressed_storage),
+]
+
+_migrated = set()
+_migrated_lock = threading.Lock()
+
+def current_version(conn):
+    """Veritabanına uygulanmış en son şema sürümünü döndürür"""
+    cursor = conn.cursor()
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TIMESTAMP
+        )
+    ''')
+    cursor.execute('SELECT COALESCE(MAX(version), 0) FROM schema_migrations')
+    return cursor.fetchone()[0]
+
+def migrate(db_path):
+    """Bekleyen migration'ları sırayla uygular, uygulanan sürümleri döndürür.
+
+    Her migration kendi işleminde (BEGIN IMMEDIATE) çalışır; aynı anda
+    başlayan uygulama ve worker süreçleri aynı sürümü iki kez uygulamaz.
+    """
+    conn = get_connection(db_path)
+    if conn.in_transaction:
+        conn.commit()
+
+    applied = []
+    for version, description, apply in MIGRATIONS:
+        cursor = conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            if version <= current_version(conn):
+                conn.commit()
+                continue
+            apply(cursor)
+            cursor.execute('''
+                INSERT INTO schema_migrations (version, description, applied_at)
+                VALUES (?, ?, ?)
+            ''', (version, description, timestamp()))
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            print(f"[HATA] Şema sürümü {version} uygulanamadı: {description}")
+            raise
+        print(f"[INFO] Şema sürümü {version} uygulandı: {description}")
+        applied.append(version)
+    return applied
+
+def ensure_schema(db_path):
+    """Şemanın güncel olduğundan emin olur; süreç başına bir kez kontrol edilir"""
+    with _migrated_lock:
+        if db_path in _migrated:
+            return
+        migrate(db_path)
+        _migrated.add(db_path)
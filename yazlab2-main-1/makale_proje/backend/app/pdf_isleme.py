@@ -1,39 +1,185 @@
 import fitz  
 from PIL import Image, ImageFilter
 import io
-from anonymizer import Anonymizer
+import multiprocessing
+from anonymizer import get_anonymizer, warm_up
+
+# Kelime kutusu yüksekliği / yazı boyutu ve alt çıkıntı / yazı boyutu
+# (Helvetica: 1.075 üst + 0.299 alt)
+WORD_BOX_HEIGHT_RATIO = 1.374
+FONT_DESCENT_RATIO = 0.299
+
+
+def _extract_image(doc, xref):
+    """Görsel nesnesini (xref) PIL görüntüsü olarak çıkarır"""
+    pix = fitz.Pixmap(doc, xref)
+    if pix.n > 3:
+        pix = fitz.Pixmap(fitz.csRGB, pix)
+    image = Image.open(io.BytesIO(pix.tobytes("png")))
+    image.load()
+    return image
+
+
+def _blur_image(image, blur_radius):
+    return image.filter(ImageFilter.GaussianBlur(radius=blur_radius))
+
+
+def _encode_png(image):
+    buf = io.BytesIO()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _collect_image_edits(doc, page, blur_radius, blurred_xrefs):
+    """
+    Sayfadaki görseller için (xref, bulanık PNG verisi) listesi döndürür.
+    Her görsel nesnesi (xref) belge başına bir kez bulanıklaştırılır; her
+    sayfada tekrar eden logo gibi görseller blurred_xrefs ile atlanır.
+    """
+    edits = []
+    image_list = page.get_images(full=True)
+    print(f"INFO [pdf_isleme.py]: Found {len(image_list)} images on page {page.number + 1}.")
+    for img in image_list:
+        xref = img[0]
+        if xref in blurred_xrefs:
+            continue
+        if not page.get_image_rects(xref):
+            continue
+        image = _extract_image(doc, xref)
+        edits.append((xref, _encode_png(_blur_image(image, blur_radius))))
+        blurred_xrefs.add(xref)
+    return edits
+
+
+def _page_words(page):
+    """
+    Sayfanın kelimelerini, NER'e verilecek sayfa metnini ve her kelimenin bu
+    metindeki (başlangıç, bitiş) konumunu döndürür. Satır sonları korunur.
+    """
+    words = page.get_text("words")
+    parts, offsets = [], []
+    pos = 0
+    prev_line = None
+    for w in words:
+        if parts:
+            parts.append(" " if (w[5], w[6]) == prev_line else "\n")
+            pos += 1
+        offsets.append((pos, pos + len(w[4])))
+        parts.append(w[4])
+        pos += len(w[4])
+        prev_line = (w[5], w[6])
+    return words, "".join(parts), offsets
+
+
+def _collect_text_edits(pages):
+    """
+    Verilen sayfaların metnini tek bir toplu NER çağrısıyla tarar ve her sayfa
+    için (alan, yeni metin, yazı boyutu) listesi döndürür.
+    """
+    page_words = [_page_words(page) for page in pages]
+    spans_per_page = get_anonymizer().find_sensitive_spans([text for _, text, _ in page_words])
+    return _spans_to_word_edits(page_words, spans_per_page)
+
+
+def _spans_to_word_edits(page_words, spans_per_page):
+    """
+    Metin aralıklarını kelime kutularına eşler. Birden çok kelimeye yayılan
+    ifadelerde ("Ahmet Yılmaz", telefon) yeni metin ilk kelimeye yazılır.
+    """
+    all_edits = []
+    for (words, _, offsets), spans in zip(page_words, spans_per_page):
+        edits = []
+        i = 0
+        last_span = None
+        for w, (start, end) in zip(words, offsets):
+            while i < len(spans) and spans[i][1] <= start:
+                i += 1
+            if i < len(spans) and spans[i][0] < end:
+                replacement = spans[i][2] if last_span != i else ''
+                last_span = i
+                # get_text("words") yazı boyutu vermez (w[5] blok numarasıdır);
+                # boyut kelime kutusunun yüksekliğinden çıkarılır
+                font_size = (w[3] - w[1]) / WORD_BOX_HEIGHT_RATIO
+                edits.append((tuple(w[0:4]), replacement, font_size))
+        all_edits.append(edits)
+    return all_edits
+
+
+def _apply_page_edits(page, image_edits, text_edits, replaced_xrefs=None):
+    # Görsel nesnesinin kendisi değiştirilir: aynı xref'i kullanan tüm sayfalar
+    # bulanık hali gösterir ve orijinal görsel dosyada kalmaz.
+    for xref, blurred_data in image_edits:
+        if replaced_xrefs is not None:
+            if xref in replaced_xrefs:
+                continue
+            replaced_xrefs.add(xref)
+        page.replace_image(xref, stream=blurred_data)
+    for rect, anonymized_text, font_size in text_edits:
+        rect = fitz.Rect(rect)
+        page.draw_rect(rect, color=(0, 0, 0), fill=(0, 0, 0), width=0.5)
+        if anonymized_text != "***":
+            # insert_text noktayı taban çizgisi olarak alır; metin kutunun içine yazılır
+            baseline = fitz.Point(rect.x0, rect.y1 - font_size * FONT_DESCENT_RATIO)
+            page.insert_text(baseline, anonymized_text, fontsize=font_size, color=(1, 1, 1), render_mode=0)
+
+
+def _analyze_pages(pdf_bytes, page_numbers, blur_radius):
+    """Havuz süreci: verilen sayfaların düzenlemelerini hesaplar (belgeyi değiştirmez)."""
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    pages = [doc[page_num] for page_num in page_numbers]
+    text_edits = _collect_text_edits(pages)
+    blurred_xrefs = set()
+    results = []
+    for page, edits in zip(pages, text_edits):
+        results.append((page.number, _collect_image_edits(doc, page, blur_radius, blurred_xrefs), edits))
+    doc.close()
+    return results
+
+
+_page_pool = None
+_page_pool_size = 0
+
+def get_page_pool(size):
+    """
+    Sayfa analiz havuzunu döndürür. Havuz belgeler arasında yeniden kullanılır;
+    böylece her süreç NER modelini yalnızca bir kez yükler.
+    """
+    global _page_pool, _page_pool_size
+    if _page_pool is None or _page_pool_size != size:
+        if _page_pool is not None:
+            _page_pool.close()
+            _page_pool.join()
+        _page_pool = multiprocessing.Pool(processes=size, initializer=warm_up)
+        _page_pool_size = size
+    return _page_pool
 
-anonymizer = Anonymizer()
 
 class PDFProcessor:
-    def __init__(self, input_pdf_path, output_pdf_path):
-        self.input_pdf_path = input_pdf_path
+    def __init__(self, input_pdf_path=None, output_pdf_path=None, stream=None):
+        """
+        PDF'i dosya yolundan ya da bellekteki veriden (bytes veya dosya nesnesi) açar.
+        """
+        self.input_pdf_path = input_pdf_path or "<stream>"
         self.output_pdf_path = output_pdf_path
-        self.doc = fitz.open(input_pdf_path)
+        if stream is not None:
+            if hasattr(stream, "read"):
+                stream = stream.read()
+            self.doc = fitz.open(stream=stream, filetype="pdf")
+        else:
+            self.doc = fitz.open(input_pdf_path)
+        # Bu belgede bulanıklaştırılmış görsel nesneleri (xref)
+        self.blurred_xrefs = set()
+
+    def _blur_page_images(self, page, blur_radius=5):
+        _apply_page_edits(page, _collect_image_edits(self.doc, page, blur_radius, self.blurred_xrefs), [])
+
+    def _anonymize_page_text(self, page):
+        _apply_page_edits(page, [], _collect_text_edits([page])[0])
 
     def blur_images(self, blur_radius=5):
         print(f"INFO [pdf_isleme.py]: Starting to blur images in PDF: {self.input_pdf_path}")
         for page in self.doc:
-            image_list = page.get_images(full=True)
-            print(f"INFO [pdf_isleme.py]: Found {len(image_list)} images on a page.")
-            for img in image_list:
-                xref = img[0]
-                rects = page.get_image_rects(xref)
-                if not rects:
-                    continue
-                pix = fitz.Pixmap(self.doc, xref)
-                if pix.n > 3:
-                    pix = fitz.Pixmap(fitz.csRGB, pix)
-                img_data = pix.tobytes("png")
-                image = Image.open(io.BytesIO(img_data))
-                blurred_image = image.filter(ImageFilter.GaussianBlur(radius=blur_radius))
-                buf = io.BytesIO()
-                blurred_image.save(buf, format="PNG")
-                buf.seek(0)
-                blurred_data = buf.getvalue()
-                for rect in rects:
-                    page.insert_image(rect, stream=blurred_data)
-                pix = None
+            self._blur_page_images(page, blur_radius)
         print(f"INFO [pdf_isleme.py]: Images blurred successfully.")
 
     def append_reviewer_comments(self, comments_text):
@@ -44,49 +190,67 @@ class PDFProcessor:
         page.insert_textbox(rect, comments_text, fontsize=12, fontname="helv")
         print(f"INFO [pdf_isleme.py]: Reviewer comments added successfully.")
 
-    def anonymize_pdf(self):
+    def anonymize_pdf(self, blur_radius=5, workers=1):
+        """
+        Her sayfada görselleri bulanıklaştırır ve metni anonimleştirir (tek geçiş).
+        workers > 1 ise sayfalar süreç havuzuna dağıtılır.
+        """
         print(f"INFO [pdf_isleme.py]: Starting anonymization process for PDF: {self.input_pdf_path}")
-        for page_num, page in enumerate(self.doc, 1):
-            print(f"INFO [pdf_isleme.py]: Processing page {page_num}.")
-            image_list = page.get_images(full=True)
-            print(f"INFO [pdf_isleme.py]: Found {len(image_list)} images on page {page_num}.")
-            for img_num, img in enumerate(image_list, 1):
-                print(f"INFO [pdf_isleme.py]: Processing image {img_num} on page {page_num}.")
-                xref = img[0]
-                rects = page.get_image_rects(xref)
-                if not rects:
-                    continue
-                pix = fitz.Pixmap(self.doc, xref)
-                if pix.n > 3:
-                    pix = fitz.Pixmap(fitz.csRGB, pix)
-                img_data = pix.tobytes("png")
-                image = Image.open(io.BytesIO(img_data))
-                blurred_image = image.filter(ImageFilter.GaussianBlur(radius=5))
-                buf = io.BytesIO()
-                blurred_image.save(buf, format="PNG")
-                buf.seek(0)
-                blurred_data = buf.getvalue()
-                for rect in rects:
-                    page.insert_image(rect, stream=blurred_data)
-                pix = None
-
-            print(f"INFO [pdf_isleme.py]: Anonymizing text on page {page_num}.")
-            text_instances = page.get_text("words")
-            for inst in text_instances:
-                text = inst[4]
-                rect = fitz.Rect(inst[0:4])
-                font_size = inst[5]
-                anonymized_text = anonymizer.anonymize(text)
-                if anonymized_text != text:
-                    page.draw_rect(rect, color=(0, 0, 0), fill=(0, 0, 0), width=0.5)
-                    if anonymized_text != "***":
-                        text_rect = fitz.Rect(rect.x0, rect.y0, rect.x1, rect.y1)
-                        page.insert_text(text_rect.tl, anonymized_text, fontsize=font_size, color=(1, 1, 1), render_mode=0)
+        if workers and workers > 1 and self.doc.page_count > 1:
+            self._anonymize_parallel(blur_radius, workers)
+        else:
+            pages = list(self.doc)
+            print(f"INFO [pdf_isleme.py]: Anonymizing text on {len(pages)} pages.")
+            text_edits = _collect_text_edits(pages)
+            for page_num, (page, edits) in enumerate(zip(pages, text_edits), 1):
+                print(f"INFO [pdf_isleme.py]: Processing page {page_num}.")
+                _apply_page_edits(page, _collect_image_edits(self.doc, page, blur_radius, self.blurred_xrefs), edits)
         print(f"INFO [pdf_isleme.py]: Anonymization process completed.")
 
+    def _anonymize_parallel(self, blur_radius, workers):
+        """
+        Sayfaları ardışık parçalara bölüp havuzdaki süreçlere dağıtır. Süreçler
+        sadece düzenlemeleri (bulanık görseller, karartılacak alanlar) hesaplar;
+        belgeye uygulama ve kaydetme ana süreçte yapılır.
+        """
+        page_count = self.doc.page_count
+        # Havuz hep yapılandırılan boyutta alınır (küçük belgede yeniden
+        # kurulup NER modeli tekrar yüklenmesin); sadece parça sayısı sınırlanır
+        chunk_count = min(workers, page_count)
+        print(f"INFO [pdf_isleme.py]: Distributing {page_count} pages across {chunk_count} processes.")
+        pdf_bytes = self.doc.tobytes()
+        chunk_size = -(-page_count // chunk_count)
+        chunks = [
+            (pdf_bytes, list(range(start, min(start + chunk_size, page_count))), blur_radius)
+            for start in range(0, page_count, chunk_size)
+        ]
+        pool = get_page_pool(workers)
+        for results in pool.starmap(_analyze_pages, chunks):
+            # Aynı görsel birden çok parçada bulanıklaştırılmış olabilir; bir kez uygulanır
+            for page_num, image_edits, text_edits in results:
+                _apply_page_edits(self.doc[page_num], image_edits, text_edits, self.blurred_xrefs)
+
+    def process(self, blur_radius=5, workers=1):
+        """
+        Yükleme hattı: PDF bir kez açılır, sayfalar bir kez dolaşılır ve
+        sonuç bir kez yazılır. blur_images + anonymize_pdf ardışık çağrısının
+        yerine kullanılmalıdır; görseller iki kez bulanıklaştırılmaz.
+        """
+        self.anonymize_pdf(blur_radius, workers)
+        return self.save()
+
     def save(self):
+        """
+        PDF'i output_pdf_path'e kaydeder; yol verilmemişse PDF'i bytes olarak döndürür.
+        """
+        if self.output_pdf_path is None:
+            print(f"INFO [pdf_isleme.py]: Serializing PDF to memory.")
+            data = self.doc.tobytes(garbage=4, deflate=True)
+            self.doc.close()
+            return data
         print(f"INFO [pdf_isleme.py]: Saving PDF to: {self.output_pdf_path}")
-        self.doc.save(self.output_pdf_path)
+        # garbage=4: replace_image sonrası kalan yinelenen görsel nesneleri birleştirilir
+        self.doc.save(self.output_pdf_path, garbage=4, deflate=True)
         self.doc.close()
         print(f"INFO [pdf_isleme.py]: PDF saved successfully.")
 
@@ -0,0 +1,68 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from flask import jsonify, send_file
+
+# Anonim PDF'ler üretildikten sonra değişmez; tarayıcı bir gün boyunca
+# yeniden istemez, sonrasında ETag ile doğrular.
+PDF_MAX_AGE = 24 * 60 * 60
+
+# Yol başına tek kayıt: (mtime, boyut, özet); sınırı aşınca en eskisi silinir
+MAX_DIGESTS = 4096
+_digests = OrderedDict()
+_digests_lock = threading.Lock()
+
+def file_digest(path):
+    """Dosyanın SHA-256 özetini döndürür; dosya değişmedikçe (mtime, boyut) bir kez hesaplanır"""
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _digests_lock:
+        entry = _digests.get(path)
+        if entry and entry[0] == version:
+            _digests.move_to_end(path)
+            return entry[1]
+
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            sha256.update(chunk)
+    digest = sha256.hexdigest()
+    with _digests_lock:
+        _digests[path] = (version, digest)
+        _digests.move_to_end(path)
+        while len(_digests) > MAX_DIGESTS:
+            _digests.popitem(last=False)
+    return digest
+
+def send_pdf(path, download_name=None, as_attachment=False):
+    """
+    PDF'i tüm PDF uç noktaları için ortak biçimde sunar:
+    içerik özetinden güçlü ETag ve Last-Modified (If-None-Match /
+    If-Modified-Since eşleşirse 304), Range istekleri için 206 ve
+    değişmeyen dosyalar için özel (private) önbellek başlıkları.
+    """
+    return send_immutable_file(path, 'application/pdf', download_name, as_attachment)
+
+def send_immutable_file(path, mimetype, download_name=None, as_attachment=False, etag=None):
+    """
+    İçeriği yolu değişmeden değişmeyen dosyaları (PDF, önizleme) sunar.
+    etag verilmezse dosyanın içerik özeti kullanılır.
+    """
+    if not path or not os.path.exists(path):
+        return jsonify({"message": "Dosya bulunamadı"}), 404
+
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        as_attachment=as_attachment,
+        download_name=download_name,
+        conditional=True,
+        etag=etag or file_digest(path),
+        max_age=PDF_MAX_AGE
+    )
+    # Makaleler kullanıcıya özeldir; ara sunucular saklamasın
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    return response
@@ -0,0 +1,127 @@
+import io
+import os
+import tempfile
+import threading
+import time
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'previews')
+
+# Yönetici listesindeki küçük resimler bu genişlikte üretilir; worker ilk
+# sayfayı anonimleştirmenin sonunda aynı ayarla önceden hazırlar.
+THUMBNAIL_WIDTH = 200
+DEFAULT_FORMAT = 'webp'
+MIN_WIDTH = 64
+MAX_WIDTH = 1600
+
+FORMATS = {
+    'webp': 'image/webp',
+    'png': 'image/png',
+}
+
+class PreviewCache:
+    """PDF sayfalarının raster önizlemeleri için disk önbelleği.
+
+    Dosyalar (depo özeti, sayfa, genişlik, biçim) anahtarıyla
+    previews/<özetin ilk iki karakteri>/ altında tutulur. Toplam boyut
+    max_bytes'ı aşarsa en uzun süredir kullanılmayan dosyalar silinir.
+    Son kullanım zamanı süreç içinde tutulur (dosyaya dokunulmaz, böylece
+    mtime ve ETag sabit kalır); bu süreçte hiç okunmamış dosyalar için
+    mtime kullanılır.
+    """
+
+    def __init__(self, root=None, max_bytes=256 * 1024 * 1024):
+        self.root = root or DEFAULT_ROOT
+        self.max_bytes = max_bytes
+        self._total = None
+        self._last_used = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def name_for(digest, page, width, fmt):
+        """Önizlemenin dosya adı; içerik adla belirlendiği için ETag olarak da kullanılır"""
+        return f"{digest}_p{page}_w{width}.{fmt}"
+
+    def path_for(self, digest, page, width, fmt):
+        return os.path.join(self.root, digest[:2], self.name_for(digest, page, width, fmt))
+
+    def get(self, pdf_path, digest, page, width=THUMBNAIL_WIDTH, fmt=DEFAULT_FORMAT):
+        """Önizlemenin dosya yolunu döndürür; yoksa üretip önbelleğe yazar.
+
+        Sayfa (1'den başlar) PDF'te yoksa IndexError fırlatılır.
+        """
+        path = self.path_for(digest, page, width, fmt)
+        if os.path.exists(path):
+            with self._lock:
+                self._last_used[path] = time.time()
+            return path
+
+        data = render_page(pdf_path, page, width, fmt)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._last_used[path] = time.time()
+        self._added(len(data))
+        return path
+
+    def _added(self, size):
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._entries())
+            else:
+                self._total += size
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.endswith('.part'):
+                    continue
+                try:
+                    stat = os.stat(os.path.join(dirpath, name))
+                except FileNotFoundError:
+                    continue
+                yield os.path.join(dirpath, name), stat.st_size, stat.st_mtime
+
+    def _evict(self):
+        # Diğer süreçlerin (worker) yazdıklarını da saymak için klasör yeniden taranır
+        entries = sorted(self._entries(), key=lambda entry: self._last_used.get(entry[0], entry[2]))
+        existing = {path for path, _, _ in entries}
+        self._last_used = {path: used for path, used in self._last_used.items() if path in existing}
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._last_used.pop(path, None)
+            total -= size
+            evicted += 1
+        self._total = total
+        print(f"[INFO] Önizleme önbelleğinden {evicted} dosya çıkarıldı")
+
+def render_page(pdf_path, page, width, fmt):
+    """PDF'in verilen sayfasını (1'den başlar) verilen genişlikte raster olarak döndürür"""
+    import fitz
+    from PIL import Image
+
+    with fitz.open(pdf_path) as doc:
+        if page < 1 or page > doc.page_count:
+            raise IndexError(f"Sayfa bulunamadı: {page}")
+        pdf_page = doc[page - 1]
+        zoom = width / pdf_page.rect.width
+        pix = pdf_page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+
+    if fmt == 'png':
+        return pix.tobytes('png')
+    image = Image.frombytes('RGB', (pix.width, pix.height), pix.samples)
+    buffer = io.BytesIO()
+    image.save(buffer, 'WEBP', quality=80)
+    return buffer.getvalue()
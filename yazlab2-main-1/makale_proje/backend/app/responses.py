@@ -0,0 +1,53 @@
+"""Liste uç noktaları için JSON yanıt katmanı.
+
+Yanıtlar orjson kuruluysa onunla, değilse json ile kodlanır. ?fields=id,title
+verilirse liste öğelerinde sadece bu alanlar döner; gövde COMPRESS_MIN_BYTES'ı
+aşıyor ve istemci kabul ediyorsa gzip ile sıkıştırılır.
+"""
+import gzip
+import json
+from flask import Response, request
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bundan küçük gövdelerde sıkıştırma CPU'ya değmez
+COMPRESS_MIN_BYTES = 1024
+COMPRESS_LEVEL = 6
+
+def dumps(data):
+    """Veriyi UTF-8 JSON bayt dizisine çevirir"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def requested_fields():
+    """?fields= parametresindeki alan adları; verilmemişse None"""
+    fields = {name.strip() for name in request.args.get('fields', '').split(',') if name.strip()}
+    return fields or None
+
+def project(items, fields):
+    return [{key: value for key, value in item.items() if key in fields} for item in items]
+
+def list_response(payload, items_key=None, status=200):
+    """
+    Liste yanıtı oluşturur. payload bir liste ya da listeyi items_key altında
+    taşıyan sayfa zarfıdır ({'articles': [...], 'next_cursor': ...}); alan
+    seçimi sadece liste öğelerine uygulanır.
+    """
+    fields = requested_fields()
+    if fields:
+        if items_key:
+            payload = dict(payload, **{items_key: project(payload[items_key], fields)})
+        else:
+            payload = project(payload, fields)
+
+    body = dumps(payload)
+    response = Response(body, status=status, mimetype='application/json')
+    response.vary.add('Accept-Encoding')
+    if len(body) >= COMPRESS_MIN_BYTES and request.accept_encodings['gzip']:
+        response.set_data(gzip.compress(body, COMPRESS_LEVEL))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
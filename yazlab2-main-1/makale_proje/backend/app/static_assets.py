@@ -0,0 +1,161 @@
+"""Frontend dosyalarının derlenmesi ve önbellek dostu sunulması.
+
+build() js/ ve css/ dosyalarını içerik özetli adlarla (admin.3f2a9c1b07.js)
+frontend/dist/ altına yazar, gzip (ve kuruluysa brotli) ile önceden sıkıştırır
+ve sayfalardaki bağlantıları yeni adlara çevirir. StaticAssets bu çıktıyı
+Accept-Encoding'e göre sıkıştırılmış haliyle sunar: özetli dosyalar değişmez
+(immutable), HTML sayfaları kısa süre sonra ETag ile yeniden doğrulanır.
+dist/ yoksa kaynak dosyalar her istekte doğrulanacak şekilde sunulur.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+from flask import request, send_file
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+from pdf_serving import file_digest
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = 'manifest.json'
+ASSET_DIRS = ('js', 'css')
+# Özetli dosyalar bir yıl, sayfalar bir dakika saklanır
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+PAGE_MAX_AGE = 60
+
+# Sayfalardaki "../js/admin.js" gibi bağlantılar
+ASSET_REF_PATTERN = re.compile(r'''(["'])((?:\.\./|/)?)((?:js|css)/[\w.-]+)(["'])''')
+
+# (uzantı, Content-Encoding) - tercih sırasıyla
+ENCODINGS = [('.br', 'br'), ('.gz', 'gzip')]
+
+def _precompress(path, data):
+    """Sıkıştırılmış kopyaları yazar (sadece daha küçükse)"""
+    variants = [('.gz', gzip.compress(data, 9, mtime=0))]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress(data, quality=11)))
+    for suffix, compressed in variants:
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+
+def build(frontend_dir):
+    """dist/ klasörünü yeniden oluşturur ve manifest'i döndürür"""
+    dist_dir = os.path.join(frontend_dir, 'dist')
+    build_dir = dist_dir + '.tmp'
+    shutil.rmtree(build_dir, ignore_errors=True)
+
+    manifest = {}
+    for asset_dir in ASSET_DIRS:
+        source_dir = os.path.join(frontend_dir, asset_dir)
+        if not os.path.isdir(source_dir):
+            continue
+        os.makedirs(os.path.join(build_dir, asset_dir))
+        for name in sorted(os.listdir(source_dir)):
+            with open(os.path.join(source_dir, name), 'rb') as f:
+                data = f.read()
+            stem, ext = os.path.splitext(name)
+            hashed = f"{asset_dir}/{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+            path = os.path.join(build_dir, *hashed.split('/'))
+            with open(path, 'wb') as f:
+                f.write(data)
+            _precompress(path, data)
+            manifest[f"{asset_dir}/{name}"] = hashed
+
+    def rewrite(match):
+        quote, prefix, ref, end = match.groups()
+        return f"{quote}{prefix}{manifest.get(ref, ref)}{end}"
+
+    pages_dir = os.path.join(frontend_dir, 'pages')
+    os.makedirs(os.path.join(build_dir, 'pages'))
+    for name in sorted(os.listdir(pages_dir)):
+        if not name.endswith('.html'):
+            continue
+        with open(os.path.join(pages_dir, name), encoding='utf-8') as f:
+            html = ASSET_REF_PATTERN.sub(rewrite, f.read())
+        path = os.path.join(build_dir, 'pages', name)
+        data = html.encode('utf-8')
+        with open(path, 'wb') as f:
+            f.write(data)
+        _precompress(path, data)
+
+    with open(os.path.join(build_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+    # Çalışan sunucu yarım kalmış bir dist/ görmesin diye klasör bütün olarak değiştirilir
+    old_dir = dist_dir + '.old'
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(dist_dir):
+        os.replace(dist_dir, old_dir)
+    os.replace(build_dir, dist_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return manifest
+
+class StaticAssets:
+    """frontend/ klasörünü (varsa derlenmiş dist/ çıktısıyla) sunar"""
+
+    def __init__(self, frontend_dir):
+        self.frontend_dir = frontend_dir
+        self.dist_dir = os.path.join(frontend_dir, 'dist')
+        self._manifest_mtime = None
+        self._hashed = set()
+
+    def _built(self):
+        """dist/ varsa True; manifest değiştiyse özetli dosya kümesini yeniler"""
+        try:
+            mtime = os.stat(os.path.join(self.dist_dir, MANIFEST_NAME)).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime != self._manifest_mtime:
+            with open(os.path.join(self.dist_dir, MANIFEST_NAME), encoding='utf-8') as f:
+                self._hashed = set(json.load(f).values())
+            self._manifest_mtime = mtime
+        return True
+
+    def send(self, path):
+        """URL yolundaki dosyayı sunar; bulunamazsa NotFound fırlatır"""
+        built = self._built()
+        if path.endswith('.html'):
+            if built:
+                return self._send(os.path.join(self.dist_dir, 'pages'), path, PAGE_MAX_AGE)
+            return self._send(os.path.join(self.frontend_dir, 'pages'), path, 0)
+        if built and path in self._hashed:
+            return self._send(self.dist_dir, path, ASSET_MAX_AGE, immutable=True)
+        if path.split('/', 1)[0] == 'dist':
+            raise NotFound()
+        return self._send(self.frontend_dir, path, 0)
+
+    def _send(self, directory, path, max_age, immutable=False):
+        file_path = safe_join(directory, path)
+        if file_path is None or not os.path.isfile(file_path):
+            raise NotFound()
+
+        encoding = None
+        for suffix, name in ENCODINGS:
+            if request.accept_encodings[name] and os.path.isfile(file_path + suffix):
+                encoding = name
+                break
+        served_path = file_path + suffix if encoding else file_path
+
+        response = send_file(
+            served_path,
+            mimetype=mimetypes.guess_type(file_path)[0] or 'application/octet-stream',
+            conditional=True,
+            etag=file_digest(served_path),
+            max_age=max_age
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        if immutable:
+            response.cache_control.immutable = True
+        elif max_age == 0:
+            response.cache_control.no_cache = True
+        return response
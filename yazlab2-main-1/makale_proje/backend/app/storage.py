@@ -0,0 +1,88 @@
+import hashlib
+import os
+import re
+import shutil
+import tempfile
+
+DEFAULT_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pdf_storage')
+
+# Anahtar biçimi: "ab/cd/<sha256>.pdf" (özetin ilk iki baytı iki seviye klasör)
+KEY_PATTERN = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.pdf$')
+
+class ContentStore:
+    """PDF'leri içerik özetine göre parçalanmış klasörlerde saklayan depo.
+
+    Aynı içerik tek dosya olarak tutulur; yazma önce kök altındaki tmp/
+    klasörüne yapılır, sonra os.replace ile atomik olarak yerine taşınır.
+    Veritabanında mutlak yol yerine depo anahtarı saklanır.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or DEFAULT_ROOT
+        self.tmp_dir = os.path.join(self.root, 'tmp')
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    @staticmethod
+    def key_for(digest):
+        return f"{digest[:2]}/{digest[2:4]}/{digest}.pdf"
+
+    @staticmethod
+    def is_key(key):
+        return bool(key) and bool(KEY_PATTERN.match(key))
+
+    @staticmethod
+    def digest(key):
+        """Anahtardaki SHA-256 özeti"""
+        return key.rsplit('/', 1)[-1][:-len('.pdf')]
+
+    def path(self, key):
+        """Anahtarın dosya yolunu döndürür; geçerli bir anahtar değilse None"""
+        if not self.is_key(key):
+            return None
+        return os.path.join(self.root, *key.split('/'))
+
+    def exists(self, key):
+        path = self.path(key)
+        return path is not None and os.path.exists(path)
+
+    def size(self, key):
+        return os.path.getsize(self.path(key))
+
+    def temp_path(self):
+        """Depoya eklenecek dosyanın yazılacağı benzersiz geçici yol"""
+        fd, path = tempfile.mkstemp(dir=self.tmp_dir, suffix='.part')
+        os.close(fd)
+        return path
+
+    def put_file(self, src_path, move=True):
+        """Dosyayı depoya ekler ve anahtarını döndürür.
+
+        move=True ise src_path depo kökü altında (temp_path) olmalıdır; dosya
+        taşınır veya içerik zaten varsa silinir. move=False ise kaynak dosyaya
+        dokunulmaz, kopyası eklenir.
+        """
+        if not move:
+            tmp_path = self.temp_path()
+            shutil.copyfile(src_path, tmp_path)
+            src_path = tmp_path
+
+        sha256 = hashlib.sha256()
+        with open(src_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha256.update(chunk)
+        key = self.key_for(sha256.hexdigest())
+        dest = self.path(key)
+
+        if os.path.exists(dest):
+            # Aynı içerik zaten depoda
+            os.remove(src_path)
+        else:
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            os.replace(src_path, dest)
+        return key
+
+    def delete(self, key):
+        """Dosyayı depodan siler; anahtara başka kayıt bağlı olmadığından emin olunmalı"""
+        path = self.path(key)
+        if path and os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import tempfile
+from flask import Request, current_app
+
+PDF_MAGIC = b'%PDF-'
+# PDF başlığı dosyanın ilk 1024 baytı içinde olmalıdır (PDF 1.7, Ek H)
+PDF_HEADER_WINDOW = 1024
+
+class UploadRejected(Exception):
+    """Yükleme daha diske yazılırken reddedildiğinde fırlatılır."""
+
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class HashingUploadFile:
+    """Yüklenen dosyayı parça parça diske yazan dosya nesnesi.
+
+    Yazarken SHA-256 özeti hesaplanır, boyut sınırı ve PDF başlığı kontrol
+    edilir; ihlal olursa dosya silinir ve UploadRejected fırlatılır. Böylece
+    hatalı yüklemeler fitz/spaCy işine hiç ulaşmaz.
+    """
+
+    def __init__(self, upload_folder, max_size=None):
+        self.max_size = max_size
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._head = b''
+        self._file = tempfile.NamedTemporaryFile(
+            dir=upload_folder, prefix='upload_', suffix='.part', delete=False
+        )
+        self.path = self._file.name
+        self.persisted = False
+
+    @property
+    def sha256(self):
+        return self._sha256.hexdigest()
+
+    @property
+    def is_pdf(self):
+        return PDF_MAGIC in self._head
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_size is not None and self.size > self.max_size:
+            self.discard()
+            raise UploadRejected(f"Dosya boyutu sınırı aşıldı (en fazla {self.max_size // (1024 * 1024)} MB)", 413)
+
+        if len(self._head) < PDF_HEADER_WINDOW:
+            self._head += data[:PDF_HEADER_WINDOW - len(self._head)]
+            if len(self._head) >= PDF_HEADER_WINDOW and not self.is_pdf:
+                self.discard()
+                raise UploadRejected("Dosya geçerli bir PDF değil")
+
+        self._sha256.update(data)
+        return self._file.write(data)
+
+    def move_to(self, path):
+        """Tamamlanan dosyayı kalıcı yoluna taşır"""
+        self._file.close()
+        os.replace(self.path, path)
+        self.path = path
+        self.persisted = True
+
+    def discard(self):
+        """Geçici dosyayı kapatıp siler"""
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    # Werkzeug'un FileStorage için beklediği okuma arayüzü
+    def read(self, *args):
+        return self._file.read(*args)
+
+    def readline(self, *args):
+        return self._file.readline(*args)
+
+    def seek(self, *args):
+        return self._file.seek(*args)
+
+    def tell(self):
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+
+class StreamingRequest(Request):
+    """Dosya parçalarını bellekte tutmadan HashingUploadFile'a yazan istek sınıfı.
+
+    app.config['UPLOAD_STREAM_FOLDER'] klasörüne yazar; sınır olarak
+    MAX_CONTENT_LENGTH kullanılır.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        upload_file = HashingUploadFile(
+            current_app.config['UPLOAD_STREAM_FOLDER'],
+            current_app.config.get('MAX_CONTENT_LENGTH')
+        )
+        self.upload_streams = getattr(self, 'upload_streams', []) + [upload_file]
+        return upload_file
+
+    def discard_uploads(self):
+        """Kalıcı yoluna taşınmamış geçici yüklemeleri siler"""
+        for upload_file in getattr(self, 'upload_streams', []):
+            if not upload_file.persisted:
+                upload_file.discard()
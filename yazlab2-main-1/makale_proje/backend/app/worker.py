@@ -0,0 +1,196 @@
+"""PDF anonimleştirme worker'ı.
+
+/api/submit-article isteği PDF'i kaydedip kuyruğa iş bırakır; asıl işleme
+(görsel bulanıklaştırma + metin anonimleştirme) bu süreçlerde yapılır.
+
+Kullanım:
+    python worker.py --processes 4
+    python worker.py --processes 2 --page-workers 4   # büyük PDF'ler için
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from job_queue import JobQueue
+from database import Database
+from anonymization_cache import AnonymizationCache
+from storage import ContentStore
+from previews import PreviewCache
+
+# Makale durumları (arka plan işleme)
+STATUS_PROCESS_FAILED = 'İşlenemedi'
+STATUS_WAITING = 'Beklemede'
+
+# Anonimleştirme kuralları veya bulanıklaştırma ayarları değiştiğinde artırılmalı;
+# önbellekteki eski sonuçlar böylece kullanılmaz.
+PIPELINE_VERSION = '2'
+
+# Tek bir PDF'in sayfalarının dağıtılacağı süreç sayısı (1: sıralı işleme)
+PAGE_WORKERS = 1
+
+# Worker bu aralıkla (sn) sinyal gönderir; üst üste üç sinyal kaçıran worker
+# /api/health/ready tarafından çalışmıyor sayılır
+HEARTBEAT_INTERVAL = 30
+WORKER_ACTIVE_SECONDS = 3 * HEARTBEAT_INTERVAL
+
+def process_article(payload):
+    """Yüklenen PDF'i bulanıklaştırıp anonimleştirir, depoya yazar ve anahtarını döndürür"""
+    # spaCy modeli ağır olduğu için sadece worker sürecinde yüklenir
+    from pdf_isleme import PDFProcessor
+
+    original_path = payload['original_path']
+    store = ContentStore()
+    output_path = store.temp_path()
+
+    try:
+        # Tek geçiş: PDF bir kez açılır, bir kez yazılır (ara dosya yok)
+        with open(original_path, 'rb') as f:
+            processor = PDFProcessor(original_path, output_path, stream=f)
+        processor.process(workers=PAGE_WORKERS)
+        key = store.put_file(output_path)
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+    print(f"[INFO] Anonimleştirilmiş PDF kaydedildi: {key}")
+
+    if payload.get('content_hash'):
+        AnonymizationCache().store(payload['content_hash'], PIPELINE_VERSION, key)
+
+    # Yönetici listesi bekletmesin diye ilk sayfanın küçük resmi şimdi üretilir
+    try:
+        PreviewCache().get(store.path(key), ContentStore.digest(key), 1)
+    except Exception as e:
+        print(f"[HATA] Küçük resim oluşturulamadı: {str(e)}")
+    return key
+
+HANDLERS = {
+    'anonymize_pdf': process_article,
+}
+
+def _remove_original(payload):
+    original_path = payload.get('original_path')
+    if original_path and os.path.exists(original_path):
+        os.remove(original_path)
+
+def handle_job(queue, db, job):
+    try:
+        file_key = HANDLERS[job['kind']](job['payload'])
+        article_id = job['payload'].get('article_id')
+        if article_id:
+            # Makale güncellemesi ve işin tamamlanması tek işlemde yapılır; biri
+            # başarısız olursa iş tamamlanmış sayılmaz ve tekrar denenir
+            queue.complete(job['id'], lambda cursor: db.finish_processing(cursor, article_id, file_key, STATUS_WAITING))
+            db.article_cache.invalidate(int(article_id))
+        else:
+            queue.complete(job['id'])
+    except Exception as e:
+        print(f"[HATA] İş başarısız: id={job['id']}, deneme={job['attempts']}: {str(e)}")
+        final = queue.fail(job['id'], e)
+        if final:
+            if job['payload'].get('article_id'):
+                db.update_article_status(job['payload']['article_id'], STATUS_PROCESS_FAILED)
+            _remove_original(job['payload'])
+        return
+
+    # Orijinal sadece iş tamamlandıktan sonra silinir; tekrar denemede gerekir
+    _remove_original(job['payload'])
+    print(f"[INFO] İş tamamlandı: id={job['id']}, tracking_code={job['tracking_code']}")
+
+class Heartbeat(threading.Thread):
+    """Worker'ın canlılık sinyalini ve işlediği işin kira süresini arka planda yeniler.
+
+    Uzun süren bir PDF işlenirken de sinyal gider; iş kirası dolup başka bir
+    worker'a düşmez. Thread kendi SQLite bağlantısını kullanır.
+    """
+
+    def __init__(self, queue, worker_name, interval):
+        super().__init__(name=f"heartbeat-{worker_name}", daemon=True)
+        self.queue = queue
+        self.worker_name = worker_name
+        self.interval = interval
+        # Ana döngü işi alınca ayarlar, bitince None yapar
+        self.job_id = None
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.queue.heartbeat(self.worker_name)
+                job_id = self.job_id
+                if job_id is not None:
+                    self.queue.renew_lease(job_id, self.worker_name)
+            except Exception as e:
+                print(f"[HATA] Worker sinyali gönderilemedi: {str(e)}")
+
+def claim_job(queue, db, worker_name):
+    """Sıradaki işi alır; süresi dolup deneme hakkı biten işlerin makaleleri başarısız sayılır"""
+    expired = []
+
+    def on_expired(cursor, job):
+        article_id = job['payload'].get('article_id')
+        if article_id:
+            db.fail_processing(cursor, int(article_id), STATUS_PROCESS_FAILED)
+        expired.append(job)
+
+    job = queue.claim(worker_name, on_expired)
+    for expired_job in expired:
+        if expired_job['payload'].get('article_id'):
+            db.article_cache.invalidate(int(expired_job['payload']['article_id']))
+        _remove_original(expired_job['payload'])
+    return job
+
+def run_worker(worker_name, poll_interval=1.0, page_workers=1, heartbeat_interval=HEARTBEAT_INTERVAL):
+    """Kuyruktaki işleri sırayla alıp işler (sonsuz döngü)"""
+    global PAGE_WORKERS
+    PAGE_WORKERS = page_workers
+    queue = JobQueue()
+    db = Database()
+    queue.register_worker(worker_name)
+
+    # NER modeli ilk işi beklemeden yüklenir
+    from anonymizer import warm_up
+    load_seconds = warm_up()
+    queue.mark_worker_ready(worker_name, load_seconds)
+    print(f"[INFO] Worker başladı: {worker_name} (NER yükleme süresi: {load_seconds:.2f} sn)")
+
+    heartbeat = Heartbeat(queue, worker_name, heartbeat_interval)
+    heartbeat.start()
+    while True:
+        job = claim_job(queue, db, worker_name)
+        if not job:
+            time.sleep(poll_interval)
+            continue
+        heartbeat.job_id = job['id']
+        try:
+            handle_job(queue, db, job)
+        finally:
+            heartbeat.job_id = None
+
+def main():
+    parser = argparse.ArgumentParser(description='PDF anonimleştirme worker süreçleri')
+    parser.add_argument('--processes', type=int, default=1, help='Çalıştırılacak worker süreci sayısı')
+    parser.add_argument('--poll-interval', type=float, default=1.0, help='Kuyruk boşken bekleme süresi (sn)')
+    parser.add_argument('--page-workers', type=int, default=1, help='Her PDF için sayfa paralel süreç sayısı')
+    args = parser.parse_args()
+
+    host = socket.gethostname()
+    if args.processes <= 1:
+        run_worker(f"{host}-{os.getpid()}", args.poll_interval, args.page_workers)
+        return
+
+    processes = []
+    for i in range(args.processes):
+        p = multiprocessing.Process(
+            target=run_worker,
+            args=(f"{host}-{os.getpid()}-{i + 1}", args.poll_interval, args.page_workers)
+        )
+        p.start()
+        processes.append(p)
+
+    for p in processes:
+        p.join()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""PDFProcessor ve Anonymizer için aşama bazlı mikro benchmark.
+
+Sentetik PDF'ler fitz ile yerelde üretilir (dış dosya gerekmez). Her aşama
+ayrı ölçülür: open, image_extract, blur, png_encode, ner, redaction, save.
+Ayrıca PDFProcessor.process uçtan uca ölçülür. Sonuçlar JSON olarak yazılır;
+iki çalıştırmanın çıktısı karşılaştırılarak gerilemeler yakalanabilir.
+
+Kullanım:
+    python benchmark_pipeline.py --pages 20 --words-per-page 300 \\
+        --images-per-page 2 --image-size 600 --pii-density 0.05 \\
+        --repeat 3 --output bench.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+# scripts/ içindeki eski anonymizer.py / pdf_isleme.py kopyaları yerine app/ modülleri kullanılır
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+# Bazı PyMuPDF sürümleri import sırasında stdout'a uyarı yazar; JSON çıktısını bozmasın
+with contextlib.redirect_stdout(sys.stderr):
+    import fitz
+    import PIL
+    from PIL import Image
+    import pdf_isleme
+    from anonymizer import get_anonymizer
+    from pdf_isleme import PDFProcessor, _page_words, _spans_to_word_edits, _apply_page_edits, _collect_image_edits
+
+FILLER_WORDS = [
+    "yöntem", "analiz", "veri", "model", "sonuç", "deney", "örnek", "sistem",
+    "çalışma", "performans", "algoritma", "değerlendirme", "literatür", "katkı",
+    "method", "results", "network", "dataset", "accuracy", "training",
+]
+PII_SAMPLES = [
+    "Ahmet Yılmaz", "Ayşe Kaya", "Mehmet Öz", "Kocaeli Üniversitesi",
+    "ahmet.yilmaz@example.com", "ayse.kaya@kocaeli.edu.tr",
+    "+90 532 123 45 67", "12345678901", "0000-0002-1825-009X",
+]
+
+STAGES = ["open", "image_extract", "blur", "png_encode", "ner", "redaction", "save"]
+
+
+def generate_pdf(pages, words_per_page, images_per_page, image_size, pii_density, seed=0):
+    """Verilen parametrelerle sentetik bir PDF üretir ve bytes olarak döndürür."""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        words = []
+        for _ in range(words_per_page):
+            words.append(rng.choice(PII_SAMPLES) if rng.random() < pii_density else rng.choice(FILLER_WORDS))
+        text_rect = fitz.Rect(50, 50 + 110 * min(images_per_page, 1), page.rect.width - 50, page.rect.height - 50)
+        page.insert_textbox(text_rect, " ".join(words), fontsize=9)
+
+        for img_num in range(images_per_page):
+            image = Image.effect_noise((image_size, image_size // 2), 50 + img_num).convert("RGB")
+            buf = io.BytesIO()
+            image.save(buf, format="PNG")
+            width = (page.rect.width - 100) / images_per_page
+            rect = fitz.Rect(50 + img_num * width, 40, 50 + (img_num + 1) * width - 5, 140)
+            page.insert_image(rect, stream=buf.getvalue())
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+# Görsel aşamaları: _collect_image_edits'in çağırdığı yardımcılar
+IMAGE_STAGES = {
+    "image_extract": "_extract_image",
+    "blur": "_blur_image",
+    "png_encode": "_encode_png",
+}
+
+
+@contextlib.contextmanager
+def timed_image_helpers(timings):
+    """
+    pdf_isleme içindeki görsel yardımcılarını süre ölçen sarmalayıcılarla
+    geçici olarak değiştirir; böylece üretimdeki _collect_image_edits
+    döngüsü olduğu gibi çalışır ve aşamaları ayrı ayrı ölçülür.
+    """
+    originals = {name: getattr(pdf_isleme, name) for name in IMAGE_STAGES.values()}
+
+    def wrap(stage, func):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings[stage] += time.perf_counter() - start
+        return timed
+
+    for stage, name in IMAGE_STAGES.items():
+        setattr(pdf_isleme, name, wrap(stage, originals[name]))
+    try:
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(pdf_isleme, name, func)
+
+
+def run_stages(pdf_bytes, blur_radius=5):
+    """Anonimleştirme hattını aşama aşama çalıştırır; aşama -> saniye döndürür."""
+    timings = dict.fromkeys(STAGES, 0.0)
+
+    start = time.perf_counter()
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    timings["open"] += time.perf_counter() - start
+
+    pages = list(doc)
+
+    # Kelime çıkarma + desen kuralları + NER
+    start = time.perf_counter()
+    page_words = [_page_words(page) for page in pages]
+    spans = get_anonymizer().find_sensitive_spans([text for _, text, _ in page_words])
+    timings["ner"] += time.perf_counter() - start
+
+    # Aralık -> kelime kutusu eşlemesi redaction aşamasına sayılır
+    start = time.perf_counter()
+    text_edits = _spans_to_word_edits(page_words, spans)
+    timings["redaction"] += time.perf_counter() - start
+
+    blurred_xrefs = set()
+    with timed_image_helpers(timings):
+        for page, edits in zip(pages, text_edits):
+            image_edits = _collect_image_edits(doc, page, blur_radius, blurred_xrefs)
+
+            start = time.perf_counter()
+            _apply_page_edits(page, image_edits, edits)
+            timings["redaction"] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    output = doc.tobytes(garbage=4, deflate=True)
+    timings["save"] += time.perf_counter() - start
+    doc.close()
+    return timings, len(output)
+
+
+def summarize(samples):
+    return {
+        "mean_s": statistics.mean(samples),
+        "min_s": min(samples),
+        "max_s": max(samples),
+        "stdev_s": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def versions():
+    result = {"python": platform.python_version(), "pymupdf": fitz.VersionBind, "pillow": PIL.__version__}
+    try:
+        import spacy
+        result["spacy"] = spacy.__version__
+    except ImportError:
+        pass
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF anonimleştirme hattı için aşama bazlı benchmark")
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--words-per-page", type=int, default=300)
+    parser.add_argument("--images-per-page", type=int, default=1)
+    parser.add_argument("--image-size", type=int, default=600, help="Görsel genişliği (px); yükseklik yarısı")
+    parser.add_argument("--pii-density", type=float, default=0.05, help="Hassas bilgi olan kelime oranı (0-1)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1, help="Uçtan uca ölçümde sayfa paralel süreç sayısı")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="-", help="JSON çıktı dosyası ('-' ise stdout)")
+    args = parser.parse_args()
+
+    config = {k: v for k, v in vars(args).items() if k != "output"}
+    pdf_bytes = generate_pdf(args.pages, args.words_per_page, args.images_per_page,
+                             args.image_size, args.pii_density, args.seed)
+
+    # Anonymizer/PDFProcessor logları stderr'e gider; stdout'a sadece JSON yazılır
+    with contextlib.redirect_stdout(sys.stderr):
+        # Model yükleme süresi ölçümlere karışmasın
+        ner_load_seconds = get_anonymizer().warm_up()
+
+        stage_samples = {stage: [] for stage in STAGES}
+        end_to_end = []
+        output_size = 0
+        for _ in range(args.repeat):
+            timings, output_size = run_stages(pdf_bytes)
+            for stage, seconds in timings.items():
+                stage_samples[stage].append(seconds)
+
+            start = time.perf_counter()
+            PDFProcessor(stream=pdf_bytes).process(workers=args.workers)
+            end_to_end.append(time.perf_counter() - start)
+
+    result = {
+        "config": config,
+        "environment": versions(),
+        "input_bytes": len(pdf_bytes),
+        "output_bytes": output_size,
+        "ner_load_s": ner_load_seconds,
+        "stages": {stage: summarize(samples) for stage, samples in stage_samples.items()},
+        "end_to_end": summarize(end_to_end),
+    }
+
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+        print(f"[INFO] Benchmark sonuçları yazıldı: {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
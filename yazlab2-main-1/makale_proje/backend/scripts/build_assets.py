@@ -0,0 +1,34 @@
+"""Frontend dosyalarını dağıtım için derler.
+
+js/ ve css/ dosyaları içerik özetli adlarla frontend/dist/ altına yazılır,
+gzip (brotli kuruluysa o da) ile önceden sıkıştırılır ve sayfalardaki
+bağlantılar yeni adlara çevrilir. Uygulama dist/ varsa oradan sunar;
+frontend'de değişiklik yapıldıktan sonra script yeniden çalıştırılmalıdır.
+
+Kullanım:
+    python build_assets.py
+"""
+import argparse
+import os
+import sys
+
+# scripts/ yerine app/ modülleri kullanılır (düz importlar)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
+
+from static_assets import brotli, build
+
+def main():
+    parser = argparse.ArgumentParser(description='Frontend derleme aracı')
+    parser.add_argument('--frontend', default=os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'frontend'))
+    args = parser.parse_args()
+
+    print(f"Frontend: {args.frontend}")
+    if brotli is None:
+        print("brotli kurulu değil; sadece gzip kopyaları üretilecek")
+    manifest = build(args.frontend)
+    for source, hashed in sorted(manifest.items()):
+        print(f"  {source} -> {hashed}")
+    print(f"{len(manifest)} dosya derlendi: {os.path.join(args.frontend, 'dist')}")
+
+if __name__ == "__main__":
+    main()
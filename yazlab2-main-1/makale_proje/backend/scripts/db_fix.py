@@ -1,43 +1,46 @@
-import sqlite3
+"""Veritabanı şemasını günceller.
+
+Tek seferlik sütun yamaları yerine app/migrations.py içindeki sürümlü
+migration'ları çalıştırır. Uygulama ve worker başlarken de aynı migration'lar
+otomatik uygulanır; bu script elle kontrol ve güncelleme içindir.
+
+Kullanım:
+    python db_fix.py            # bekleyen migration'ları uygula
+    python db_fix.py --status   # sadece mevcut sürümü göster
+"""
+import argparse
 import os
 import sys
 
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from app.database import Database
-
-def fix_database():
-    db = Database()
-    print(f"Working with database at: {db.db_path}")
-    
-    try:
-        with sqlite3.connect(db.db_path) as conn:
-            cursor = conn.cursor()
-         
-            cursor.execute("PRAGMA table_info(articles)")
-            columns = [column[1] for column in cursor.fetchall()]
-            print(f"Current columns in articles table: {columns}")
-         
-            if 'original_filename' not in columns:
-                print("Adding 'original_filename' column to articles table")
-                cursor.execute("ALTER TABLE articles ADD COLUMN original_filename TEXT")
-            
-         
-            cursor.execute("PRAGMA table_info(articles)")
-            columns = [column[1] for column in cursor.fetchall()]
-            print(f"Updated columns in articles table: {columns}")
-            
-            conn.commit()
-            print("Database structure updated successfully!")
-    
-    except Exception as e:
-        print(f"Error fixing database: {str(e)}")
-        return False
-    
-    return True
+# scripts/ yerine app/ modülleri kullanılır (düz importlar)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app'))
 
-if __name__ == "__main__":
-    success = fix_database()
-    if success:
-        print("Database migration completed successfully.")
+from database import get_connection
+from migrations import MIGRATIONS, current_version, migrate
+
+def main():
+    parser = argparse.ArgumentParser(description='Veritabanı şema migration aracı')
+    parser.add_argument('--db', default=os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app', 'makale.db'))
+    parser.add_argument('--status', action='store_true', help='Migration uygulamadan sürümü göster')
+    args = parser.parse_args()
+
+    print(f"Veritabanı: {args.db}")
+    conn = get_connection(args.db)
+    version = current_version(conn)
+    conn.commit()
+    latest = MIGRATIONS[-1][0]
+    print(f"Mevcut şema sürümü: {version} (en güncel: {latest})")
+
+    if args.status:
+        for number, description, _ in MIGRATIONS:
+            print(f"  [{'x' if number <= version else ' '}] {number}: {description}")
+        return
+
+    applied = migrate(args.db)
+    if applied:
+        print(f"Uygulanan sürümler: {applied}")
     else:
-        print("Database migration failed.")
+        print("Şema zaten güncel.")
+
+if __name__ == "__main__":
+    main()
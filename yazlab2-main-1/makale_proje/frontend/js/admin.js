@@ -1,9 +1,14 @@
 // API temel URL'i
 const API_BASE_URL = 'http://localhost:5000/api';
 
+// Makale listesi sayfa boyutu
+const ARTICLES_PAGE_SIZE = 50;
+
 // Global state
 let state = {
     articles: [],
+    nextCursor: null,
+    totalArticles: null,
     auditLogs: [],
     uploadedArticles: [],
     currentArticleId: null,
@@ -23,10 +28,21 @@ function initializeElements() {
         errorContainer: document.getElementById('errorContainer')
     };
 
-    // Event listeners for filters
-    elements.searchInput?.addEventListener('input', () => filterAndDisplayArticles());
-    elements.statusFilter?.addEventListener('change', () => filterAndDisplayArticles());
-    elements.sortOption?.addEventListener('change', () => filterAndDisplayArticles());
+    // Event listeners for filters (arama, durum ve tarih sıralaması sunucuda yapılır)
+    let searchTimer = null;
+    elements.searchInput?.addEventListener('input', () => {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => loadArticles(), 300);
+    });
+    elements.statusFilter?.addEventListener('change', () => loadArticles());
+    elements.sortOption?.addEventListener('change', () => {
+        if (elements.sortOption.value.startsWith('date_')) {
+            loadArticles();
+        } else {
+            filterAndDisplayArticles();
+        }
+    });
+    document.getElementById('loadMoreArticles')?.addEventListener('click', () => loadArticles(false));
 
     return elements;
 }
@@ -62,13 +78,35 @@ function showError(message, isTemporary = true) {
     }
 }
 
-// Makaleleri yükle
-async function loadArticles() {
+// Liste filtrelerinden sorgu parametrelerini oluştur
+function buildArticleQuery(cursor) {
+    const params = new URLSearchParams({
+        limit: ARTICLES_PAGE_SIZE,
+        fields: 'id,title,status,upload_date'
+    });
+    const searchTerm = document.getElementById('searchInput')?.value.trim();
+    const statusValue = document.getElementById('statusFilter')?.value;
+    const sortValue = document.getElementById('sortOption')?.value;
+
+    if (searchTerm) params.set('q', searchTerm);
+    if (statusValue) params.set('status', statusValue);
+    if (sortValue === 'date_asc') params.set('sort', 'date_asc');
+    if (cursor) {
+        params.set('cursor', cursor);
+    } else {
+        params.set('total', '1');
+    }
+    return params.toString();
+}
+
+// Makaleleri yükle (reset=false ise sonraki sayfa eklenir)
+async function loadArticles(reset = true) {
     try {
         setLoading(true);
         console.log('Makaleleri yüklüyorum...');
-        
-        const response = await fetch(`${API_BASE_URL}/articles`, {
+
+        const cursor = reset ? null : state.nextCursor;
+        const response = await fetch(`${API_BASE_URL}/articles?${buildArticleQuery(cursor)}`, {
             method: 'GET',
             headers: {
                 'Accept': 'application/json',
@@ -80,11 +118,11 @@ async function loadArticles() {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
 
-        const articles = await response.json();
-        console.log('Makaleler başarıyla yüklendi:', articles);
+        const page = await response.json();
+        console.log('Makaleler başarıyla yüklendi:', page);
         
         // Normalize article data
-        state.articles = articles.map(article => ({
+        const articles = page.articles.map(article => ({
             id: article.id,
             title: article.title,
             status: normalizeStatus(article.status),
@@ -92,7 +130,14 @@ async function loadArticles() {
             author: article.author || 'Bilinmiyor'
         }));
 
-        displayArticles(state.articles);
+        state.articles = reset ? articles : state.articles.concat(articles);
+        state.nextCursor = page.next_cursor;
+        if (page.total !== undefined) {
+            state.totalArticles = page.total;
+        }
+
+        filterAndDisplayArticles();
+        updateArticlePager();
     } catch (error) {
         console.error('Makaleler yüklenirken hata:', error);
         // Hata popup'ını kaldırdık, sadece konsola loglama yapıyoruz
@@ -101,6 +146,18 @@ async function loadArticles() {
     }
 }
 
+// "Daha fazla yükle" butonunu ve makale sayısını güncelle
+function updateArticlePager() {
+    const loadMoreButton = document.getElementById('loadMoreArticles');
+    if (loadMoreButton) {
+        loadMoreButton.style.display = state.nextCursor ? 'inline-block' : 'none';
+    }
+    const countLabel = document.getElementById('articleCount');
+    if (countLabel && state.totalArticles !== null) {
+        countLabel.textContent = `${state.articles.length} / ${state.totalArticles} makale`;
+    }
+}
+
 // Logları yükle
 async function loadAuditLogs() {
     try {
@@ -143,44 +200,20 @@ function normalizeStatus(status) {
     return statusMap[status] || status;
 }
 
-// Makaleleri filtrele ve göster
+// Yüklenen makaleleri sırala ve göster (filtreleme sunucuda yapılır)
 function filterAndDisplayArticles() {
-    const searchInput = document.getElementById('searchInput');
-    const statusFilter = document.getElementById('statusFilter');
     const sortOption = document.getElementById('sortOption');
+    const sortValue = sortOption ? sortOption.value : 'date_desc';
+
+    // Tarih sıralaması sunucudan geldiği gibidir; başlık sıralaması yüklenen sayfalar üzerinde yapılır
+    const sortedArticles = [...state.articles];
+    if (sortValue === 'title_asc') {
+        sortedArticles.sort((a, b) => a.title.localeCompare(b.title));
+    } else if (sortValue === 'title_desc') {
+        sortedArticles.sort((a, b) => b.title.localeCompare(a.title));
+    }
 
-    if (!searchInput || !statusFilter || !sortOption) return;
-
-    const searchTerm = searchInput.value.toLowerCase();
-    const statusValue = statusFilter.value;
-    const sortValue = sortOption.value;
-    
-    let filteredArticles = state.articles.filter(article => {
-        const matchesSearch = article.title.toLowerCase().includes(searchTerm);
-        const matchesStatus = !statusValue || article.status === statusValue;
-        return matchesSearch && matchesStatus;
-    });
-    
-    // Sıralama
-    filteredArticles.sort((a, b) => {
-        const dateA = new Date(a.submission_date);
-        const dateB = new Date(b.submission_date);
-        
-        switch (sortValue) {
-            case 'date_desc':
-                return dateB - dateA;
-            case 'date_asc':
-                return dateA - dateB;
-            case 'title_asc':
-                return a.title.localeCompare(b.title);
-            case 'title_desc':
-                return b.title.localeCompare(a.title);
-            default:
-                return 0;
-        }
-    });
-    
-    displayArticles(filteredArticles);
+    displayArticles(sortedArticles);
 }
 
 // Makaleleri tabloda göster
@@ -194,6 +227,10 @@ function displayArticles(articles) {
         const row = document.createElement('tr');
         row.innerHTML = `
             <td>${article.id}</td>
+            <td>
+                <img src="${API_BASE_URL}/articles/${article.id}/preview/1" alt="" width="50"
+                     loading="lazy" onerror="this.style.visibility='hidden'">
+            </td>
             <td>${article.title}</td>
             <td><span class="badge bg-${getStatusBadgeColor(article.status)}">${article.status}</span></td>
             <td>${formatDate(article.submission_date)}</td>
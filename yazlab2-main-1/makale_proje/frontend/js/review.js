@@ -45,8 +45,16 @@ async function loadAssignedArticles() {
     if (!currentReviewerEmail) return;
     
     try {
-        const response = await fetch(`${API_BASE_URL}/reviewer/articles/${currentReviewerEmail}`);
-        const articles = await response.json();
+        const articles = [];
+        let cursor = null;
+        do {
+            const params = new URLSearchParams({ limit: 100, fields: 'id,title,status' });
+            if (cursor) params.set('cursor', cursor);
+            const response = await fetch(`${API_BASE_URL}/reviewer/articles/${currentReviewerEmail}?${params}`);
+            const page = await response.json();
+            articles.push(...page.articles);
+            cursor = page.next_cursor;
+        } while (cursor);
         
         const tbody = document.getElementById('assignedArticlesList');
         tbody.innerHTML = '';
@@ -37,11 +37,19 @@ function setupLogout() {
     }
 }
 
-// Makaleleri yükle
-async function loadArticles() {
+// Bekleyen makaleler (sayfalı)
+let pendingArticles = [];
+let nextCursor = null;
+
+// Hakem panelini yükle: sayaçlar + bekleyen makalelerin ilk sayfası.
+// Sunucu ETag döndürür; tarayıcı yenilemelerde If-None-Match ile doğrular.
+async function loadArticles(cursor = null) {
     try {
         const reviewerEmail = localStorage.getItem('reviewerEmail');
-        const response = await fetch(`${API_BASE_URL}/reviewer/articles/${reviewerEmail}`, {
+        const params = new URLSearchParams({ limit: 50 });
+        if (cursor) params.set('cursor', cursor);
+
+        const response = await fetch(`${API_BASE_URL}/reviewer/dashboard/${reviewerEmail}?${params}`, {
             method: 'GET',
             headers: {
                 'Accept': 'application/json'
@@ -52,14 +60,37 @@ async function loadArticles() {
             throw new Error(`HTTP error! status: ${response.status}`);
         }
         
-        const articles = await response.json();
-        displayArticles(articles);
+        const dashboard = await response.json();
+        pendingArticles = cursor ? pendingArticles.concat(dashboard.pending.articles) : dashboard.pending.articles;
+        nextCursor = dashboard.pending.next_cursor;
+
+        displayCounts(dashboard.counts);
+        displayArticles(pendingArticles);
+
+        const loadMoreButton = document.getElementById('loadMoreArticles');
+        if (loadMoreButton) {
+            loadMoreButton.style.display = nextCursor ? 'inline-block' : 'none';
+            loadMoreButton.onclick = () => loadArticles(nextCursor);
+        }
     } catch (error) {
         console.error('Makaleler yüklenirken hata:', error);
         showError('Makaleler yüklenirken bir hata oluştu. Lütfen tekrar deneyin.');
     }
 }
 
+// Bekleyen / tamamlanan / gecikmiş sayılarını göster
+function displayCounts(counts) {
+    const fields = {
+        pendingCount: counts.pending,
+        completedCount: counts.completed,
+        overdueCount: counts.overdue
+    };
+    Object.entries(fields).forEach(([id, value]) => {
+        const element = document.getElementById(id);
+        if (element) element.textContent = value;
+    });
+}
+
 // Makaleleri tabloya ekle
 function displayArticles(articles) {
     const tableBody = document.getElementById('articlesTableBody');